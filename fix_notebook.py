@@ -1,8 +1,76 @@
 import json
+import sys
+
+# orjson parses and serializes notebooks considerably faster; fall back to json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both only appear once the Gemini model selector and System Setup fix are in
+PATCHED_MARKERS = (b'GEMINI_MODEL_NAME', b'Dummy ALSA config')
+
+# Gemini section of a cell: from its form header up to the launch command
+GEMINI_HEADER = '# @markdown Use Gemini API for enhanced script generation'
+
+def splice_gemini_section(source, command, replacement):
+    """Replace a cell's Gemini section in its list-of-lines source, in place
+    
+    Only the lines from the Gemini form header up to the launch command are
+    touched, so the rest of the cell is never joined into one string.
+    Returns True if the section was found and replaced.
+    """
+    for start, line in enumerate(source):
+        head = line.find(GEMINI_HEADER)
+        if head != -1:
+            break
+    else:
+        return False
+    
+    for end in range(start, len(source)):
+        launch = source[end].find(command, head + len(GEMINI_HEADER) if end == start else 0)
+        if launch != -1:
+            break
+    else:
+        return False
+    
+    source[start:end + 1] = [source[start][:head] + replacement + source[end][launch:]]
+    return True
+
+def write_notebook(notebook, f):
+    """Write the notebook as compact JSON with orjson, one cell at a time
+    
+    Streams the cells so the serialized notebook is never held in memory as a
+    whole. Jupyter and Colab read compact JSON fine and re-indent on save.
+    """
+    f.write(b'{')
+    for n, (key, value) in enumerate(notebook.items()):
+        if n:
+            f.write(b',')
+        f.write(orjson.dumps(key) + b':')
+        if key == 'cells':
+            f.write(b'[')
+            for i, cell in enumerate(value):
+                if i:
+                    f.write(b',')
+                f.write(orjson.dumps(cell))
+            f.write(b']')
+        else:
+            f.write(orjson.dumps(value))
+    f.write(b'}')
 
 # Read the notebook
-with open('UnQTube_Colab.ipynb', 'r') as f:
-    notebook = json.load(f)
+with open('UnQTube_Colab.ipynb', 'rb') as f:
+    raw_notebook = f.read()
+
+# Skip the parse and rewrite entirely if a previous run already patched it
+if PATCHED_MARKERS[0] in raw_notebook and PATCHED_MARKERS[1] in raw_notebook:
+    print("UnQTube_Colab.ipynb is already patched, nothing to do")
+    sys.exit(0)
+
+notebook = orjson.loads(raw_notebook) if orjson else json.loads(raw_notebook)
+# Release the raw bytes before the cells are patched and re-serialized
+del raw_notebook
 
 # Update the System Setup cell (first cell)
 system_setup_cell = notebook['cells'][0]
@@ -47,9 +115,9 @@ print("System setup complete.")"""
 long_video_cell = notebook['cells'][2]
 long_video_source = long_video_cell['source']
 
-# Convert source to string if it's a list
-if isinstance(long_video_source, list):
-    long_video_source = ''.join(long_video_source)
+# Work on the list-of-lines form Jupyter stores sources in
+if isinstance(long_video_source, str):
+    long_video_source = long_video_source.splitlines(keepends=True)
 
 # Add Gemini model selector after API key and update the config handling
 gemini_form_field = """# @markdown Use Gemini API for enhanced script generation (optional)
@@ -57,112 +125,92 @@ GEMINI_API_KEY = \"\" #@param {type:\"string\"}
 # @markdown Select Gemini model
 GEMINI_MODEL_NAME = \"gemini-1.5-flash-latest\" #@param [\"gemini-1.0-pro\", \"gemini-1.5-flash-latest\", \"gemini-1.5-pro-latest\"]
 
+import os
+import re
+
+CONFIG_KEY_RE = re.compile(r\"^[ \\t]*(gemini_api|gemini_model|use_gemini)[ \\t]*=.*$\", re.M)
+
+def _update_config(path, updates, append_missing):
+    # One read, one regex pass over the keys being set, one atomic write
+    with open(path, \"r\") as f_read:
+        text = f_read.read()
+
+    updated_keys = set()
+    def replace_value(match):
+        key = match.group(1)
+        if key not in updates:
+            return match.group(0)
+        updated_keys.add(key)
+        return f\"{key} = {updates[key]}\"
+
+    text = CONFIG_KEY_RE.sub(replace_value, text)
+
+    # If keys were not in original file, add them
+    if append_missing:
+        missing = \"\".join(f\"{key} = {value}\\n\" for key, value in updates.items() if key not in updated_keys)
+        if missing and text and not text.endswith(\"\\n\"):
+            text += \"\\n\"
+        text += missing
+
+    tmp_path = path + \".tmp\"
+    with open(tmp_path, \"w\") as f_write:
+        f_write.write(text)
+    os.replace(tmp_path, path)
+
 # Update config.txt with Gemini API Key and model from form
 gemini_api_key_from_form = GEMINI_API_KEY # Gets value from the form field
 gemini_model_from_form = GEMINI_MODEL_NAME # Gets model from the form field
+config_path = \"/content/UnQTube-/config.txt\"
 
 if gemini_api_key_from_form:
     print(f\"Attempting to update config.txt with Gemini API Key: {gemini_api_key_from_form[:5]}... and model: {gemini_model_from_form}\")
-    config_path = \"/content/UnQTube-/config.txt\"
-    try:
-        with open(config_path, \"r\") as f_read:
-            lines = f_read.readlines()
-        
-        updated_lines = []
-        key_updated = False
-        model_updated = False
-        gemini_enabled = False
-
-        for line in lines:
-            stripped_line = line.strip()
-            if stripped_line.startswith(\"gemini_api\"):
-                updated_lines.append(f\"gemini_api = {gemini_api_key_from_form}\\n\")
-                key_updated = True
-            elif stripped_line.startswith(\"gemini_model\"):
-                updated_lines.append(f\"gemini_model = {gemini_model_from_form}\\n\")
-                model_updated = True
-            elif stripped_line.startswith(\"use_gemini\"):
-                updated_lines.append(\"use_gemini = yes\\n\")
-                gemini_enabled = True
-            else:
-                updated_lines.append(line)
-        
-        # If keys were not in original file, add them
-        if not key_updated:
-            updated_lines.append(f\"gemini_api = {gemini_api_key_from_form}\\n\")
-        if not model_updated:
-            updated_lines.append(f\"gemini_model = {gemini_model_from_form}\\n\")
-        if not gemini_enabled:
-            updated_lines.append(\"use_gemini = yes\\n\")
-
-        with open(config_path, \"w\") as f_write:
-            f_write.writelines(updated_lines)
-        print(f\"Successfully updated {config_path} with Gemini API Key, model {gemini_model_from_form}, and set use_gemini to yes.\")
-
-    except FileNotFoundError:
-        print(f\"ERROR: {config_path} not found. Cannot update Gemini API Key.\")
-    except Exception as e:
-        print(f\"ERROR: Could not update {config_path}. Error: {e}\")
+    config_updates = {
+        \"gemini_api\": gemini_api_key_from_form,
+        \"gemini_model\": gemini_model_from_form,
+        \"use_gemini\": \"yes\",
+    }
 else:
     # Ensure Gemini is disabled if no key is provided
     print(\"No Gemini API Key provided in the form. Ensuring Gemini is disabled in config.\")
-    config_path = \"/content/UnQTube-/config.txt\"
-    try:
-        with open(config_path, \"r\") as f_read:
-            lines = f_read.readlines()
-        
-        updated_lines = []
-        for line in lines:
-            stripped_line = line.strip()
-            if stripped_line.startswith(\"gemini_api\"):
-                updated_lines.append(\"gemini_api = \\n\") 
-            elif stripped_line.startswith(\"use_gemini\"):
-                updated_lines.append(\"use_gemini = no\\n\")
-            else:
-                updated_lines.append(line)
-        
-        with open(config_path, \"w\") as f_write:
-            f_write.writelines(updated_lines)
+    config_updates = {\"gemini_api\": \"\", \"use_gemini\": \"no\"}
+
+try:
+    _update_config(config_path, config_updates, append_missing=bool(gemini_api_key_from_form))
+    if gemini_api_key_from_form:
+        print(f\"Successfully updated {config_path} with Gemini API Key, model {gemini_model_from_form}, and set use_gemini to yes.\")
+    else:
         print(f\"Updated {config_path}: Cleared Gemini API key and set use_gemini to no.\")
-    except Exception as e:
-        print(f\"ERROR: Could not update {config_path} to disable Gemini. Error: {e}\")"""
+
+except FileNotFoundError:
+    print(f\"ERROR: {config_path} not found. Cannot update Gemini API Key.\")
+except Exception as e:
+    print(f\"ERROR: Could not update {config_path}. Error: {e}\")"""
+
+# Built once and shared by both cells
+gemini_replacement = gemini_form_field + "\n\n"
 
 # Find the existing Gemini API key field and replace it with our updated fields
-if "GEMINI_API_KEY" in long_video_source:
-    # Find the start position of Gemini API section
-    start_pos = long_video_source.find("# @markdown Use Gemini API for enhanced script generation")
-    
-    # Find the end position (where the command starts)
-    end_pos = long_video_source.find("!python video.py")
-    
-    if start_pos > 0 and end_pos > 0:
-        # Replace the entire Gemini section
-        updated_source = long_video_source[:start_pos] + gemini_form_field + "\n\n" + long_video_source[end_pos:]
-        long_video_cell['source'] = updated_source
+if splice_gemini_section(long_video_source, "!python video.py", gemini_replacement):
+    long_video_cell['source'] = long_video_source
 
 # Update Short Video cell with Gemini model selector
 short_video_cell = notebook['cells'][3]
 short_video_source = short_video_cell['source']
 
-# Convert source to string if it's a list
-if isinstance(short_video_source, list):
-    short_video_source = ''.join(short_video_source)
+# Work on the list-of-lines form Jupyter stores sources in
+if isinstance(short_video_source, str):
+    short_video_source = short_video_source.splitlines(keepends=True)
 
 # Find the existing Gemini API key field and replace it with our updated fields
-if "GEMINI_API_KEY" in short_video_source:
-    # Find the start position of Gemini API section
-    start_pos = short_video_source.find("# @markdown Use Gemini API for enhanced script generation")
-    
-    # Find the end position (where the command starts)
-    end_pos = short_video_source.find("!python short.py")
-    
-    if start_pos > 0 and end_pos > 0:
-        # Replace the entire Gemini section
-        updated_source = short_video_source[:start_pos] + gemini_form_field + "\n\n" + short_video_source[end_pos:]
-        short_video_cell['source'] = updated_source
+if splice_gemini_section(short_video_source, "!python short.py", gemini_replacement):
+    short_video_cell['source'] = short_video_source
 
 # Write the updated notebook back to file
-with open('UnQTube_Colab.ipynb', 'w') as f:
-    json.dump(notebook, f, indent=2)
+if orjson:
+    with open('UnQTube_Colab.ipynb', 'wb') as f:
+        write_notebook(notebook, f)
+else:
+    with open('UnQTube_Colab.ipynb', 'w') as f:
+        json.dump(notebook, f, separators=(",", ":"))
 
 print("Successfully updated UnQTube_Colab.ipynb with Gemini model selector and fixed System Setup cell") 
\ No newline at end of file
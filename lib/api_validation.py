@@ -5,10 +5,121 @@ This module provides validation functions for API keys and service availability.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import aiohttp
 import asyncio
+import functools
+import importlib.util
 import json
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Tuple, Optional
 
+GEMINI_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+PEXELS_SEARCH_URL = "https://api.pexels.com/v1/search"
+
+# Shared session so repeat validations reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Validation results keyed by (service, api_key), reused for a short while so
+# repeat checks of the same key skip the network round-trip
+_VALIDATION_TTL = 60
+_VALIDATION_CACHE: Dict[Tuple[str, str], Tuple[float, Tuple[bool, str]]] = {}
+_validation_lock = threading.Lock()
+
+# Statuses that settle whether a key is valid (200) or invalid (400/401/403)
+_DEFINITIVE_STATUSES = frozenset({200, 400, 401, 403})
+
+def _get_cached_validation(service: str, api_key: str) -> Optional[Tuple[bool, str]]:
+    """
+    Return a cached validation result if it is still fresh
+    
+    Args:
+        service (str): Service identifier ("gemini" or "pexels")
+        api_key (str): The stripped API key
+        
+    Returns:
+        Optional[Tuple[bool, str]]: The cached (is_valid, message), or None
+    """
+    with _validation_lock:
+        hit = _VALIDATION_CACHE.get((service, api_key))
+        if hit and time.monotonic() - hit[0] < _VALIDATION_TTL:
+            return hit[1]
+    return None
+
+def _cache_validation(service: str, api_key: str, status_code: int,
+                      result: Tuple[bool, str]) -> Tuple[bool, str]:
+    """
+    Store a validation result if it is definitive and return it unchanged
+    
+    Rate limits and server errors say nothing lasting about the key, so
+    those results are returned without caching and the next check retries.
+    
+    Args:
+        service (str): Service identifier ("gemini" or "pexels")
+        api_key (str): The stripped API key
+        status_code (int): HTTP status code the result was derived from
+        result (Tuple[bool, str]): The (is_valid, message) to cache
+        
+    Returns:
+        Tuple[bool, str]: The same result, for use in return statements
+    """
+    if status_code in _DEFINITIVE_STATUSES:
+        with _validation_lock:
+            _VALIDATION_CACHE[(service, api_key)] = (time.monotonic(), result)
+    return result
+
+def _gemini_validation_result(status_code: int, payload: Optional[dict]) -> Tuple[bool, str]:
+    """
+    Interpret a Gemini models-list response
+    
+    Args:
+        status_code (int): HTTP status code of the response
+        payload (Optional[dict]): Decoded JSON body, or None if it was not JSON
+        
+    Returns:
+        Tuple[bool, str]: (is_valid, message)
+    """
+    if status_code == 200:
+        model_count = len((payload or {}).get("models", []))
+        return True, f"✅ Valid API key with access to {model_count} models"
+    elif status_code == 400:
+        if payload is None:
+            return False, "❌ Invalid API key format"
+        error_message = payload.get("error", {}).get("message", "Invalid API key format")
+        return False, f"❌ Invalid API key: {error_message}"
+    elif status_code == 403:
+        return False, "❌ API key is valid but access is forbidden. Check your API permissions."
+    elif status_code == 429:
+        return False, "⚠️ API key is valid but rate limited. Try again in a few minutes."
+    else:
+        return False, f"❌ API validation failed with status {status_code}"
+
+def _pexels_validation_result(status_code: int) -> Tuple[bool, str]:
+    """
+    Interpret a Pexels search response
+    
+    Args:
+        status_code (int): HTTP status code of the response
+        
+    Returns:
+        Tuple[bool, str]: (is_valid, message)
+    """
+    if status_code == 200:
+        return True, "✅ Valid Pexels API key"
+    elif status_code == 401:
+        return False, "❌ Invalid Pexels API key"
+    elif status_code == 429:
+        return False, "⚠️ Pexels API key is valid but rate limited"
+    else:
+        return False, f"❌ Pexels API validation failed with status {status_code}"
+
 def validate_gemini_api_key(api_key: str) -> Tuple[bool, str]:
     """
     Validate Google Gemini API key by making a test request
@@ -22,30 +133,22 @@ def validate_gemini_api_key(api_key: str) -> Tuple[bool, str]:
     if not api_key or len(api_key.strip()) < 10:
         return False, "API key is too short or empty"
     
+    cached = _get_cached_validation("gemini", api_key.strip())
+    if cached:
+        return cached
+    
     try:
         # Test the API key by fetching available models
-        url = "https://generativelanguage.googleapis.com/v1beta/models"
         params = {"key": api_key.strip()}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(GEMINI_MODELS_URL, params=params, timeout=10)
         
-        if response.status_code == 200:
-            models_data = response.json()
-            model_count = len(models_data.get("models", []))
-            return True, f"✅ Valid API key with access to {model_count} models"
-        elif response.status_code == 400:
-            try:
-                error_data = response.json()
-                error_message = error_data.get("error", {}).get("message", "Invalid API key format")
-                return False, f"❌ Invalid API key: {error_message}"
-            except:
-                return False, "❌ Invalid API key format"
-        elif response.status_code == 403:
-            return False, "❌ API key is valid but access is forbidden. Check your API permissions."
-        elif response.status_code == 429:
-            return False, "⚠️ API key is valid but rate limited. Try again in a few minutes."
-        else:
-            return False, f"❌ API validation failed with status {response.status_code}"
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return _cache_validation("gemini", api_key.strip(), response.status_code,
+                                 _gemini_validation_result(response.status_code, payload))
             
     except requests.RequestException as e:
         return False, f"❌ Network error during validation: {str(e)}"
@@ -65,40 +168,105 @@ def validate_pexels_api_key(api_key: str) -> Tuple[bool, str]:
     if not api_key or len(api_key.strip()) < 10:
         return False, "API key is too short or empty"
     
+    cached = _get_cached_validation("pexels", api_key.strip())
+    if cached:
+        return cached
+    
     try:
         # Test the API key with a minimal search request
-        url = "https://api.pexels.com/v1/search"
         headers = {"Authorization": api_key.strip()}
         params = {"query": "test", "per_page": 1}
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = _SESSION.get(PEXELS_SEARCH_URL, headers=headers, params=params, timeout=10)
         
-        if response.status_code == 200:
-            data = response.json()
-            return True, "✅ Valid Pexels API key"
-        elif response.status_code == 401:
-            return False, "❌ Invalid Pexels API key"
-        elif response.status_code == 429:
-            return False, "⚠️ Pexels API key is valid but rate limited"
-        else:
-            return False, f"❌ Pexels API validation failed with status {response.status_code}"
+        return _cache_validation("pexels", api_key.strip(), response.status_code,
+                                 _pexels_validation_result(response.status_code))
             
     except requests.RequestException as e:
         return False, f"❌ Network error during Pexels validation: {str(e)}"
     except Exception as e:
         return False, f"❌ Unexpected error during Pexels validation: {str(e)}"
 
-def check_system_requirements() -> Dict[str, Tuple[bool, str]]:
+REQUIRED_PACKAGES = (
+    "requests", "asyncio", "json", "tkinter",
+    "moviepy", "numpy", "PIL", "pydub"
+)
+
+def _check_pkg(name: str) -> bool:
+    """
+    Check whether a package is importable without importing it
+    
+    Args:
+        name (str): Top-level package name
+        
+    Returns:
+        bool: True if the package is already loaded or can be found
+    """
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+@functools.lru_cache(maxsize=1)
+def _check_packages() -> Dict[str, Tuple[bool, str]]:
+    """
+    Check the required packages once per process
+    
+    Returns:
+        Dict[str, Tuple[bool, str]]: Dictionary of package checks
+    """
+    packages = {}
+    for package in REQUIRED_PACKAGES:
+        if _check_pkg(package):
+            packages[package] = (True, f"✅ {package} installed")
+        else:
+            packages[package] = (False, f"❌ {package} not installed")
+    return packages
+
+@functools.lru_cache(maxsize=2)
+def _check_ffmpeg(deep: bool = False) -> Tuple[bool, str]:
+    """
+    Check whether FFmpeg is available
+    
+    Args:
+        deep (bool): Also run "ffmpeg -version" to confirm the binary works,
+            instead of only looking it up on PATH
+        
+    Returns:
+        Tuple[bool, str]: (is_available, message)
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        return (False, "❌ FFmpeg not found")
+    if not deep:
+        return (True, f"✅ FFmpeg at {ffmpeg_path}")
+    
+    try:
+        result = subprocess.run([ffmpeg_path, "-version"], capture_output=True, timeout=5)
+        if result.returncode == 0:
+            return (True, f"✅ FFmpeg available at {ffmpeg_path}")
+        return (False, "❌ FFmpeg not working properly")
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return (False, "❌ FFmpeg not found")
+    except Exception:
+        return (False, "❌ FFmpeg check failed")
+
+def check_system_requirements(deep: bool = False) -> Dict[str, Tuple[bool, str]]:
     """
     Check system requirements for video generation
     
+    Args:
+        deep (bool): Run FFmpeg to confirm it works rather than only
+            checking that it is on PATH
+        
     Returns:
         Dict[str, Tuple[bool, str]]: Dictionary of requirement checks
     """
     requirements = {}
     
     # Check Python version
-    import sys
     python_version = sys.version_info
     if python_version.major >= 3 and python_version.minor >= 8:
         requirements["python"] = (True, f"✅ Python {python_version.major}.{python_version.minor}.{python_version.micro}")
@@ -106,34 +274,13 @@ def check_system_requirements() -> Dict[str, Tuple[bool, str]]:
         requirements["python"] = (False, f"❌ Python {python_version.major}.{python_version.minor} (requires 3.8+)")
     
     # Check required packages
-    required_packages = [
-        "requests", "asyncio", "json", "tkinter", 
-        "moviepy", "numpy", "PIL", "pydub"
-    ]
-    
-    for package in required_packages:
-        try:
-            __import__(package)
-            requirements[package] = (True, f"✅ {package} installed")
-        except ImportError:
-            requirements[package] = (False, f"❌ {package} not installed")
+    requirements.update(_check_packages())
     
     # Check FFmpeg availability
-    try:
-        import subprocess
-        result = subprocess.run(["ffmpeg", "-version"], capture_output=True, timeout=5)
-        if result.returncode == 0:
-            requirements["ffmpeg"] = (True, "✅ FFmpeg available")
-        else:
-            requirements["ffmpeg"] = (False, "❌ FFmpeg not working properly")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        requirements["ffmpeg"] = (False, "❌ FFmpeg not found")
-    except Exception:
-        requirements["ffmpeg"] = (False, "❌ FFmpeg check failed")
+    requirements["ffmpeg"] = _check_ffmpeg(deep)
     
     # Check disk space (basic check)
     try:
-        import shutil
         free_space_gb = shutil.disk_usage(".").free / (1024**3)
         if free_space_gb > 5:
             requirements["disk_space"] = (True, f"✅ {free_space_gb:.1f}GB available")
@@ -144,6 +291,13 @@ def check_system_requirements() -> Dict[str, Tuple[bool, str]]:
     
     return requirements
 
+SUPPORTED_LANGUAGES = frozenset({
+    "english", "hindi", "bengali", "telugu", "marathi", "tamil", "urdu",
+    "gujarati", "kannada", "malayalam", "punjabi", "assamese", "odia",
+    "persian", "arabic", "vietnamese", "spanish", "french", "german",
+    "italian", "japanese", "korean", "portuguese", "russian", "turkish"
+})
+
 def validate_video_settings(topic: str, duration: str, language: str) -> Tuple[bool, str]:
     """
     Validate video generation settings
@@ -157,10 +311,11 @@ def validate_video_settings(topic: str, duration: str, language: str) -> Tuple[b
         Tuple[bool, str]: (is_valid, message)
     """
     # Validate topic
-    if not topic or len(topic.strip()) < 3:
+    topic_length = len(topic.strip()) if topic else 0
+    if topic_length < 3:
         return False, "Topic must be at least 3 characters long"
     
-    if len(topic.strip()) > 200:
+    if topic_length > 200:
         return False, "Topic is too long (max 200 characters)"
     
     # Validate duration
@@ -174,18 +329,14 @@ def validate_video_settings(topic: str, duration: str, language: str) -> Tuple[b
         return False, "Duration must be a valid number"
     
     # Validate language
-    supported_languages = [
-        "english", "hindi", "bengali", "telugu", "marathi", "tamil", "urdu",
-        "gujarati", "kannada", "malayalam", "punjabi", "assamese", "odia",
-        "persian", "arabic", "vietnamese", "spanish", "french", "german", 
-        "italian", "japanese", "korean", "portuguese", "russian", "turkish"
-    ]
-    
-    if language.lower() not in supported_languages:
+    if language.lower() not in SUPPORTED_LANGUAGES:
         return False, f"Language '{language}' not supported"
     
     return True, "✅ Video settings are valid"
 
+# 401/403 are expected for API endpoints without auth, 405 for servers that refuse HEAD
+REACHABLE_STATUSES = frozenset({200, 301, 302, 400, 401, 403, 405})
+
 async def quick_connectivity_check() -> Dict[str, bool]:
     """
     Quick check of internet connectivity to required services
@@ -199,56 +350,133 @@ async def quick_connectivity_check() -> Dict[str, bool]:
         "general_internet": "https://httpbin.org/get"
     }
     
-    connectivity = {}
+    async def probe(session: aiohttp.ClientSession, url: str) -> bool:
+        # HEAD keeps the probe body-less; any of these statuses means the server answered
+        async with session.head(url, allow_redirects=False,
+                                timeout=aiohttp.ClientTimeout(total=5)) as response:
+            return response.status in REACHABLE_STATUSES
     
-    for service, url in services.items():
+    # Probe every service at once over a single session
+    async with aiohttp.ClientSession() as session:
+        results = await asyncio.gather(
+            *(probe(session, url) for url in services.values()),
+            return_exceptions=True
+        )
+    
+    return {
+        service: result is True
+        for service, result in zip(services, results)
+    }
+
+def _platform_info() -> Tuple[str, str, str]:
+    """
+    Get the platform details shown in the system report
+    
+    Returns:
+        Tuple[str, str, str]: (system, release, machine)
+    """
+    return platform.system(), platform.release(), platform.machine()
+
+async def _build_report_async() -> str:
+    """
+    Build the system report, running its independent sections concurrently
+    
+    Returns:
+        str: Formatted system report
+    """
+    async def connectivity_check():
+        # A failed probe run is reported in the output rather than raised
         try:
-            response = requests.get(url, timeout=5)
-            connectivity[service] = response.status_code in [200, 403]  # 403 is OK for API endpoints without auth
-        except:
-            connectivity[service] = False
+            return await quick_connectivity_check()
+        except Exception as e:
+            return e
     
-    return connectivity
+    requirements, connectivity, platform_details = await asyncio.gather(
+        asyncio.to_thread(check_system_requirements),
+        connectivity_check(),
+        asyncio.to_thread(_platform_info)
+    )
+    return _format_report(requirements, connectivity, platform_details)
 
-def generate_system_report() -> str:
+def _format_report(requirements: Dict[str, Tuple[bool, str]], connectivity,
+                   platform_details: Tuple[str, str, str]) -> str:
     """
-    Generate a comprehensive system report for troubleshooting
+    Format the collected system report sections
     
+    Args:
+        requirements (Dict[str, Tuple[bool, str]]): Result of check_system_requirements
+        connectivity: Result of quick_connectivity_check, or the exception it raised
+        platform_details (Tuple[str, str, str]): (system, release, machine)
+        
     Returns:
         str: Formatted system report
     """
+    system, release, machine = platform_details
     report = ["🔍 UnQTube System Report", "=" * 50, ""]
     
     # System requirements
-    requirements = check_system_requirements()
     report.append("📋 System Requirements:")
     for req, (status, message) in requirements.items():
         report.append(f"  {message}")
     report.append("")
     
     # Connectivity check
-    try:
-        import asyncio
-        connectivity = asyncio.run(quick_connectivity_check())
+    if isinstance(connectivity, Exception):
+        report.append(f"🌐 Connectivity check failed: {connectivity}")
+        report.append("")
+    else:
         report.append("🌐 Connectivity Status:")
         for service, status in connectivity.items():
             status_icon = "✅" if status else "❌"
             report.append(f"  {status_icon} {service.replace('_', ' ').title()}")
         report.append("")
-    except Exception as e:
-        report.append(f"🌐 Connectivity check failed: {e}")
-        report.append("")
     
     # Python environment
-    import sys, platform
     report.append("🐍 Python Environment:")
     report.append(f"  Python Version: {sys.version}")
-    report.append(f"  Platform: {platform.system()} {platform.release()}")
-    report.append(f"  Architecture: {platform.machine()}")
+    report.append(f"  Platform: {system} {release}")
+    report.append(f"  Architecture: {machine}")
     report.append("")
     
     return "\n".join(report)
 
+# Last generated report as (timestamp, report), reused for _REPORT_TTL seconds
+_REPORT_TTL = 60
+_report_cache: Optional[Tuple[float, str]] = None
+
+def generate_system_report() -> str:
+    """
+    Generate a comprehensive system report for troubleshooting
+    
+    Returns:
+        str: Formatted system report
+    """
+    global _report_cache
+    
+    if _report_cache and time.monotonic() - _report_cache[0] < _REPORT_TTL:
+        return _report_cache[1]
+    
+    try:
+        asyncio.get_running_loop()
+        loop_running = True
+    except RuntimeError:
+        loop_running = False
+    
+    try:
+        if loop_running:
+            # asyncio.run() cannot nest inside a running loop (Jupyter/Colab),
+            # so build the report on a worker thread with its own loop
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                report = executor.submit(lambda: asyncio.run(_build_report_async())).result()
+        else:
+            report = asyncio.run(_build_report_async())
+    except Exception as e:
+        # Fall back to the synchronous checks and note the failed probes;
+        # the degraded report is not cached so the next call retries
+        return _format_report(check_system_requirements(), e, _platform_info())
+    _report_cache = (time.monotonic(), report)
+    return report
+
 if __name__ == "__main__":
     # Test the validation functions
     print(generate_system_report())
\ No newline at end of file
@@ -7,19 +7,198 @@ to drastically improve performance and parallelism.
 
 import os
 import asyncio
+import functools
+import multiprocessing
+import queue
+import random
 import shutil
+import subprocess
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import traceback
+import urllib.parse
+
+import aiohttp
+import cv2
+import numpy as np
+from moviepy.editor import concatenate_videoclips
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from lib.content_generation import generate_top10_content, generate_short_content
 from lib.config_utils import read_config_file
-from lib.image_procces import getim, delete_invalid_images, sortimage, shape_error
-from lib.media_api import download_file, get_videos
-from lib.video_editor import mergevideo
+from lib.gemini_api import close_gemini_session
+from lib.image_procces import getim, process_images_fused
+from lib.media_api import get_videos
+from lib.video_editor import mergevideo, preencode_segment
 from lib.voices import generate_voice
 from lib.language import get_language_code
 from lib.core import get_temp_dir
+from lib.shortcore import get_video, resize_and_text
+
+# Worker processes for CPU-bound image clean-up, shared by every generator
+# and started on first use so the worker start-up cost is paid once per run
+_process_pool = None
+
+# Seconds to wait for ffmpeg to encode a fallback clip before using OpenCV
+_FALLBACK_ENCODE_TIMEOUT = 60
+
+# Seconds to wait for the pre-encoder to finish the queued items after the
+# last segment is ready
+_PREENCODE_DRAIN_TIMEOUT = 300
+
+def _pin_worker(core_ids):
+    """Pin a pool worker process to one core so image work keeps its caches warm
+    
+    Args:
+        core_ids (multiprocessing.Queue): One core ID per worker; each worker
+            takes the next one as it starts
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        core = core_ids.get(block=False)
+    except queue.Empty:
+        # More workers started than IDs handed out; leave this one unpinned
+        return
+    try:
+        os.sched_setaffinity(0, {core})
+    except OSError:
+        # Restricted environment; leave scheduling to the OS
+        pass
+
+def _pool_context():
+    """Get the multiprocessing context for the shared process pool
+    
+    The pool starts after the I/O thread pool and aiohttp's resolver
+    already have threads running, so forking the parent could copy a lock
+    held by one of them into a worker. forkserver (or spawn
+    where it is unavailable) starts workers from a clean process instead.
+    
+    Returns:
+        multiprocessing.context.BaseContext: Context for the pool workers
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+def _get_process_pool():
+    """Get the shared process pool, creating it on first use
+    
+    Returns:
+        ProcessPoolExecutor: The shared process pool
+    """
+    global _process_pool
+    if _process_pool is None:
+        max_workers = min(os.cpu_count() or 4, 8)
+        context = _pool_context()
+        if hasattr(os, "sched_getaffinity") and hasattr(os, "sched_setaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+            core_ids = context.Queue()
+            for worker_id in range(max_workers):
+                core_ids.put(cores[worker_id % len(cores)])
+            _process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                                initializer=_pin_worker, initargs=(core_ids,))
+        else:
+            _process_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+    return _process_pool
+
+@functools.lru_cache(maxsize=1)
+def _cached_config():
+    """Read config.txt once per run
+    
+    Returns:
+        dict: Configuration values
+    """
+    return read_config_file()
+
+@functools.lru_cache(maxsize=None)
+def _read_list_file(path):
+    """Read a download list once per run
+    
+    Args:
+        path (str): Path to the list file
+        
+    Returns:
+        tuple: Stripped, non-empty lines of the file
+    """
+    with open(path, "r") as f:
+        return tuple(line.strip() for line in f if line.strip())
+
+def _shutdown_process_pool():
+    """Shut down the shared process pool if it was started"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True)
+        _process_pool = None
+
+def new_event_loop():
+    """Create an event loop, using uvloop's libuv-based loop when installed
+    
+    Returns:
+        asyncio.AbstractEventLoop: A new event loop
+    """
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+def run(coro):
+    """Run a coroutine to completion on a new event loop
+    
+    Drop-in replacement for asyncio.run() that picks up uvloop when it is
+    installed, which lowers the per-await overhead of the many concurrent
+    HTTP requests and subprocess waits in the pipeline.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    if hasattr(asyncio, "Runner"):
+        with asyncio.Runner(loop_factory=new_event_loop) as runner:
+            return runner.run(coro)
+    if uvloop is not None:
+        uvloop.install()
+    return asyncio.run(coro)
+
+async def _run_all(*coros):
+    """Run segment coroutines concurrently and cancel the rest on the first failure
+    
+    The _process_* methods log their own errors and report them by returning
+    False, so a False result counts as a failure just like an exception.
+    Either way the remaining segments are cancelled, so a broken run stops
+    spending bandwidth and API quota, and the original exception is raised
+    as-is rather than wrapped in an ExceptionGroup.
+    
+    Args:
+        *coros: Coroutines to run
+        
+    Raises:
+        RuntimeError: If a segment returned False
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+                if task.result() is False:
+                    raise RuntimeError("A segment failed to process; cancelled the remaining segments")
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
 class AsyncVideoGenerator:
     """Asynchronous video generation pipeline
@@ -43,6 +222,123 @@ class AsyncVideoGenerator:
         self.temp_dir = get_temp_dir()
         self.content = None
         self.max_workers = min(os.cpu_count() or 4, 8)  # Limit based on available CPU cores
+        self._proc_pool = _get_process_pool()
+        # Wide pool for blocking network, TTS and ffmpeg calls
+        self._io_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="unqtube-io")
+        # Finished item folders waiting to be pre-encoded (set up per video)
+        self._ready_q = None
+        # HTTP session for direct downloads, created on first use
+        self._http = None
+        # Image folders by normalized search term, as futures resolving to the
+        # folder once its images are downloaded and cleaned up
+        self._image_cache = {}
+        # Caps on concurrent calls so large lists don't flood the TTS and media backends
+        self._tts_sem = asyncio.Semaphore(4)
+        self._http_sem = asyncio.Semaphore(16)
+        # Title frame shared by the image and video fallbacks, drawn on first use
+        self._fallback_frame = None
+        self._fallback_jpeg_bytes = None
+        
+    def close(self):
+        """Shut down the I/O threads and the image processing workers"""
+        self._io_pool.shutdown(wait=False)
+        _shutdown_process_pool()
+        
+    async def aclose(self):
+        """Close the HTTP sessions used for direct downloads and Gemini"""
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        await close_gemini_session()
+        
+    async def _ensure_session(self):
+        """Get the shared HTTP session, creating it on first use
+        
+        Returns:
+            aiohttp.ClientSession: Session with a pooled, DNS-caching connector
+        """
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+        return self._http
+        
+    async def _adownload(self, url, save_path):
+        """Stream a file to disk on the event loop
+        
+        Args:
+            url (str): URL to download
+            save_path (str): Path to save the file
+            
+        Returns:
+            bool: True if the file was downloaded, False otherwise
+        """
+        session = await self._ensure_session()
+        async with self._http_sem:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    print("Failed to download the file.")
+                    return False
+                if aiofiles:
+                    async with aiofiles.open(save_path, 'wb') as file:
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            await file.write(chunk)
+                else:
+                    with open(save_path, 'wb') as file:
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            file.write(chunk)
+        print("file downloaded successfully.")
+        return True
+        
+    async def _run_io(self, fn, *args):
+        """Run a blocking function on the generator's I/O thread pool
+        
+        Args:
+            fn (callable): Blocking function to run
+            *args: Positional arguments for fn
+            
+        Returns:
+            The return value of fn
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(fn, *args))
+        
+    async def _run_limited(self, sem, fn, *args):
+        """Run a blocking function on the I/O pool once the semaphore allows it
+        
+        Args:
+            sem (asyncio.Semaphore): Limit for the backend fn talks to
+            fn (callable): Blocking function to run
+            *args: Positional arguments for fn
+            
+        Returns:
+            The return value of fn
+        """
+        async with sem:
+            return await self._run_io(fn, *args)
+        
+    async def _warmup(self):
+        """Pay first-use costs before the segments fan out
+        
+        Opens the download session and a keep-alive connection to the outro
+        image host, and loads the Gemini TTS module if it will be used. No
+        TTS or search requests are made, so no API quota is spent.
+        """
+        async def open_outro_connection():
+            outro_urls = await self._run_io(_read_list_file, "download_list/outro_pic.txt")
+            if not outro_urls:
+                return
+            parts = urllib.parse.urlsplit(outro_urls[0])
+            session = await self._ensure_session()
+            async with session.head(f"{parts.scheme}://{parts.netloc}/", allow_redirects=False,
+                                    timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+        
+        results = await asyncio.gather(open_outro_connection(), self._run_io(_preload_tts),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Warmup step skipped: {result}")
         
     async def generate_video(self):
         """Generate a complete video with all components running in parallel
@@ -52,6 +348,7 @@ class AsyncVideoGenerator:
         Returns:
             str: Path to the generated video file
         """
+        warmup = None
         try:
             start_time = time.time()
             print(f"\n==== Starting asynchronous video generation for '{self.title}' ====")
@@ -59,6 +356,9 @@ class AsyncVideoGenerator:
             # Ensure temp directory exists
             os.makedirs(self.temp_dir, exist_ok=True)
             
+            # Warm up connections and lazy imports while the content is generated
+            warmup = asyncio.create_task(self._warmup())
+            
             # First generate content (needed before we can start other tasks)
             print("Generating content...")
             self.content = await generate_top10_content(self.title, self.genre, self.language)
@@ -68,21 +368,28 @@ class AsyncVideoGenerator:
                 
             print(f"✓ Content generated with {len(self.content['top10'])} items")
             
-            # Create intro in parallel with item processing
-            intro_task = asyncio.create_task(self._process_intro())
+            # Create every segment folder in one pass off the event loop
+            segment_dirs = [os.path.join(self.temp_dir, "11"), os.path.join(self.temp_dir, "0")]
+            segment_dirs += [os.path.join(self.temp_dir, str(i + 1)) for i in range(len(self.content["top10"]))]
+            await self._run_io(_batch_mkdir, segment_dirs)
             
-            # Process all items in parallel
-            print("Processing all segments in parallel...")
-            top10_tasks = []
-            for i, item in enumerate(self.content["top10"]):
-                task = asyncio.create_task(self._process_item(item, i + 1))
-                top10_tasks.append(task)
-                
-            # Create outro in parallel
-            outro_task = asyncio.create_task(self._process_outro())
+            await warmup
             
-            # Wait for all tasks to complete
-            await asyncio.gather(intro_task, outro_task, *top10_tasks)
+            # Pre-encode finished items while the remaining ones are still downloading
+            self._ready_q = asyncio.Queue(maxsize=4)
+            preencoder = asyncio.create_task(self._consume_and_preencode())
+            
+            # Process intro, outro and all items in parallel
+            print("Processing all segments in parallel...")
+            item_coros = [self._process_item(item, i + 1) for i, item in enumerate(self.content["top10"])]
+            try:
+                await _run_all(self._process_intro(), self._process_outro(), *item_coros)
+            except BaseException:
+                # The run is failing; don't wait for the pre-encoder to drain
+                preencoder.cancel()
+                await asyncio.gather(preencoder, return_exceptions=True)
+                raise
+            await self._finish_preencoder(preencoder)
             
             # Merge everything into final video
             print("\nAll components ready. Merging final video...")
@@ -98,6 +405,9 @@ class AsyncVideoGenerator:
             print(f"Error during async video generation: {e}")
             traceback.print_exc()
             raise
+        finally:
+            if warmup is not None and not warmup.done():
+                warmup.cancel()
             
     async def generate_short_video(self, duration=30):
         """Generate a short-form vertical video
@@ -124,15 +434,13 @@ class AsyncVideoGenerator:
                 
             print(f"✓ Content generated with {len(self.content['scenes'])} scenes")
             
+            # Create every scene folder in one pass off the event loop
+            scene_dirs = [os.path.join(self.temp_dir, f"scene_{i + 1}") for i in range(len(self.content["scenes"]))]
+            await self._run_io(_batch_mkdir, scene_dirs)
+            
             # Process all scenes in parallel
             print("Processing all scenes in parallel...")
-            scene_tasks = []
-            for i, scene in enumerate(self.content["scenes"]):
-                task = asyncio.create_task(self._process_scene(scene, i + 1))
-                scene_tasks.append(task)
-                
-            # Wait for all scenes to be processed
-            await asyncio.gather(*scene_tasks)
+            await _run_all(*(self._process_scene(scene, i + 1) for i, scene in enumerate(self.content["scenes"])))
             
             # Merge everything into final video
             print("\nAll scenes ready. Merging final short video...")
@@ -156,7 +464,6 @@ class AsyncVideoGenerator:
             bool: True if successful, False otherwise
         """
         intro_dir = os.path.join(self.temp_dir, "11")
-        os.makedirs(intro_dir, exist_ok=True)
         
         try:
             # Extract intro text
@@ -199,7 +506,6 @@ class AsyncVideoGenerator:
             bool: True if successful, False otherwise
         """
         item_dir = os.path.join(self.temp_dir, str(num))
-        os.makedirs(item_dir, exist_ok=True)
         
         try:
             # Extract item info
@@ -228,11 +534,54 @@ class AsyncVideoGenerator:
             # Wait for both tasks to complete
             await asyncio.gather(audio_task, media_task)
             
+            # Hand the finished folder to the pre-encoder
+            if self._ready_q is not None:
+                await self._ready_q.put((num, item_dir, name))
+            
             return True
         except Exception as e:
             print(f"Error processing item {num}: {e}")
             return False
             
+    async def _finish_preencoder(self, preencoder):
+        """Let the pre-encoder work through the queue, then stop it
+        
+        The sentinel is only queued while the pre-encoder is still running,
+        since a put on the full queue would otherwise block forever. Each wait
+        is bounded by _PREENCODE_DRAIN_TIMEOUT; any segment left unencoded is
+        built by mergevideo instead.
+        
+        Args:
+            preencoder (asyncio.Task): The _consume_and_preencode task
+        """
+        try:
+            if not preencoder.done():
+                await asyncio.wait_for(self._ready_q.put(None), timeout=_PREENCODE_DRAIN_TIMEOUT)
+            await asyncio.wait_for(preencoder, timeout=_PREENCODE_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("Pre-encoding did not finish in time; remaining segments will be encoded during the merge")
+            preencoder.cancel()
+            await asyncio.gather(preencoder, return_exceptions=True)
+        except Exception as e:
+            print(f"Pre-encoder stopped with an error: {e}")
+        
+    async def _consume_and_preencode(self):
+        """Pre-encode item segments as they become ready
+        
+        Runs until a None sentinel is taken from the queue, so encoding
+        overlaps with the items that are still being processed.
+        """
+        while True:
+            ready = await self._ready_q.get()
+            if ready is None:
+                break
+            num, item_dir, name = ready
+            try:
+                await self._run_io(preencode_segment, item_dir, num, f"{num}.{name}")
+            except Exception as e:
+                # mergevideo builds the segment itself if no pre-encoded file exists
+                print(f"Error pre-encoding item {num}: {e}")
+            
     async def _process_outro(self):
         """Process outro segment with text and media
         
@@ -240,7 +589,6 @@ class AsyncVideoGenerator:
             bool: True if successful, False otherwise
         """
         outro_dir = os.path.join(self.temp_dir, "0")
-        os.makedirs(outro_dir, exist_ok=True)
         
         try:
             # Extract outro text
@@ -283,7 +631,6 @@ class AsyncVideoGenerator:
             bool: True if successful, False otherwise
         """
         scene_dir = os.path.join(self.temp_dir, f"scene_{num}")
-        os.makedirs(scene_dir, exist_ok=True)
         
         try:
             # Extract scene info
@@ -310,27 +657,28 @@ class AsyncVideoGenerator:
             print(f"Error processing scene {num}: {e}")
             return False
     
-    async def _generate_audio(self, text, output_file):
+    def _generate_audio(self, text, output_file):
         """Generate audio for text asynchronously
         
+        Returns the pool coroutine directly so callers await it without an
+        extra wrapper frame; failures surface at the caller's await.
+        
         Args:
             text (str): Text to convert to speech
             output_file (str): Path to save audio file
             
         Returns:
-            str: Path to generated audio file
+            Coroutine: Resolves to the path of the generated audio file
         """
-        try:
-            # Run in a thread pool since generate_voice is not async
-            result = await asyncio.to_thread(generate_voice, text, output_file, self.language_code)
-            return result
-        except Exception as e:
-            print(f"Error generating audio: {e}")
-            raise
+        # Run in a thread pool since generate_voice is not async
+        return self._run_limited(self._tts_sem, generate_voice, text, output_file, self.language_code)
             
     async def _get_images(self, search_term, output_dir):
         """Download and process images for a segment
         
+        Segments that share a search term reuse the first segment's images
+        instead of downloading the same results again.
+        
         Args:
             search_term (str): Term to search for images
             output_dir (str): Directory to save images
@@ -338,25 +686,73 @@ class AsyncVideoGenerator:
         Returns:
             bool: True if successful, False otherwise
         """
+        key = search_term.lower().strip()
+        pending = self._image_cache.get(key)
+        if pending is not None:
+            source_dir = await pending
+            if source_dir:
+                try:
+                    await self._run_io(_copy_images, source_dir, output_dir)
+                    return True
+                except Exception as e:
+                    print(f"Error reusing images for '{search_term}': {e}")
+        
+        # First request for this term; later ones wait on this future
+        fetch = asyncio.get_running_loop().create_future()
+        if pending is None:
+            self._image_cache[key] = fetch
+        
         try:
             # Download images asynchronously
-            await asyncio.to_thread(getim, search_term, output_dir)
-            
-            # Process images in separate threads
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Run image processing tasks in thread pool
-                await asyncio.gather(
-                    asyncio.to_thread(delete_invalid_images, output_dir),
-                    asyncio.to_thread(sortimage, output_dir),
-                    asyncio.to_thread(shape_error, output_dir)
-                )
-                
+            await self._run_limited(self._http_sem, getim, search_term, output_dir)
+            
+            # Clean up the images in a worker process in one pass over the
+            # folder, while other segments' folders are processed on other cores
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._proc_pool, process_images_fused, output_dir)
+            
+            fetch.set_result(output_dir)
             return True
         except Exception as e:
             print(f"Error getting images for '{search_term}': {e}")
             # Create fallback blank image
             self._create_fallback_image(output_dir)
             return False
+        finally:
+            if not fetch.done():
+                # Let segments waiting on this term download for themselves
+                fetch.set_result(None)
+                if self._image_cache.get(key) is fetch:
+                    del self._image_cache[key]
+            
+    def _get_fallback_frame(self):
+        """Get the title frame used by image and video fallbacks
+        
+        The frame is drawn once per generator and treated as read-only.
+        
+        Returns:
+            numpy.ndarray: 1920x1080 BGR frame with the title on black
+        """
+        if self._fallback_frame is None:
+            frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+            # Add some text
+            font = cv2.FONT_HERSHEY_SIMPLEX
+            cv2.putText(frame, f"{self.title}", (100, 540), font, 2, (255, 255, 255), 5, cv2.LINE_AA)
+            self._fallback_frame = frame
+        return self._fallback_frame
+            
+    def _get_fallback_jpeg(self):
+        """Get the fallback frame encoded as JPEG, encoding it only once
+        
+        Returns:
+            bytes: JPEG data for the fallback frame
+        """
+        if self._fallback_jpeg_bytes is None:
+            ok, buf = cv2.imencode('.jpg', self._get_fallback_frame(), [int(cv2.IMWRITE_JPEG_QUALITY), 85])
+            if not ok:
+                raise ValueError("Could not encode fallback frame")
+            self._fallback_jpeg_bytes = buf.tobytes()
+        return self._fallback_jpeg_bytes
             
     def _create_fallback_image(self, directory):
         """Create a fallback image when download fails
@@ -364,15 +760,9 @@ class AsyncVideoGenerator:
         Args:
             directory (str): Directory to save fallback image
         """
-        import numpy as np
-        import cv2
-        
         try:
-            blank_img = np.zeros((1080, 1920, 3), dtype=np.uint8)
-            # Add some text
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            cv2.putText(blank_img, f"{self.title}", (100, 540), font, 2, (255, 255, 255), 5, cv2.LINE_AA)
-            cv2.imwrite(os.path.join(directory, "fallback.jpg"), blank_img)
+            with open(os.path.join(directory, "fallback.jpg"), 'wb') as f:
+                f.write(self._get_fallback_jpeg())
         except Exception as e:
             print(f"Error creating fallback image: {e}")
     
@@ -387,15 +777,15 @@ class AsyncVideoGenerator:
         """
         try:
             # Check if we should use video for intro
-            use_video = read_config_file().get("intro_video", "no").lower() in ["yes", "true", "1"]
+            use_video = _cached_config().get("intro_video", "no").lower() in ["yes", "true", "1"]
             
             if use_video:
                 # Get intro video
                 try:
-                    video_links = await asyncio.to_thread(get_videos, self.title)
+                    video_links = await self._run_limited(self._http_sem, get_videos, self.title)
                     if video_links:
                         intro_video = os.path.join(intro_dir, "intro.mp4")
-                        await asyncio.to_thread(download_file, video_links[0], intro_video)
+                        await self._adownload(video_links[0], intro_video)
                         return True
                 except Exception as e:
                     print(f"Error getting intro video: {e}")
@@ -426,13 +816,11 @@ class AsyncVideoGenerator:
             image_path = os.path.join(outro_dir, "1.jpg")
             
             try:
-                with open("download_list/outro_pic.txt", "r") as f:
-                    lines = f.readlines()
-                    if lines:
-                        import random
-                        outro_image_url = random.choice(lines).strip()
-                        await asyncio.to_thread(download_file, outro_image_url, image_path)
-                        return True
+                lines = _read_list_file("download_list/outro_pic.txt")
+                if lines:
+                    outro_image_url = random.choice(lines)
+                    await self._adownload(outro_image_url, image_path)
+                    return True
             except Exception as e:
                 print(f"Error reading outro image list: {e}")
                 
@@ -456,15 +844,14 @@ class AsyncVideoGenerator:
             bool: True if successful, False otherwise
         """
         try:
-            from lib.shortcore import get_video
-            
             # Get video using the shortcore function
-            result = await asyncio.to_thread(get_video, search_term, output_file)
+            result = await self._run_limited(self._http_sem, get_video, search_term, output_file)
             return result
         except Exception as e:
             print(f"Error getting video for '{search_term}': {e}")
-            # Create fallback video
-            self._create_fallback_video(output_file)
+            # Create fallback video off the event loop so a slow encode
+            # does not stall the other downloads
+            await self._run_io(self._create_fallback_video, output_file)
             return False
             
     def _create_fallback_video(self, output_file):
@@ -473,23 +860,39 @@ class AsyncVideoGenerator:
         Args:
             output_file (str): Path to save fallback video
         """
-        import numpy as np
-        import cv2
-        
         try:
             # Create a 3-second blank video
             fps = 30
             duration = 3
             height, width = 1080, 1920
+            blank_frame = self._get_fallback_frame()
+            
+            # Let ffmpeg loop a single still instead of encoding every identical frame
+            if shutil.which("ffmpeg"):
+                frame_file = f"{output_file}.jpg"
+                with open(frame_file, 'wb') as f:
+                    f.write(self._get_fallback_jpeg())
+                try:
+                    result = subprocess.run(
+                        ["ffmpeg", "-y", "-loop", "1", "-i", frame_file, "-t", str(duration),
+                         "-r", str(fps), "-c:v", "libx264", "-tune", "stillimage",
+                         "-preset", "ultrafast", "-pix_fmt", "yuv420p", output_file],
+                        capture_output=True,
+                        timeout=_FALLBACK_ENCODE_TIMEOUT
+                    )
+                    encoded = result.returncode == 0
+                except subprocess.TimeoutExpired:
+                    print("ffmpeg timed out encoding the fallback video")
+                    encoded = False
+                finally:
+                    os.remove(frame_file)
+                if encoded:
+                    return
+                print("ffmpeg could not encode the fallback video, writing frames with OpenCV")
             
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
             video = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
             
-            # Create blank frame with text
-            blank_frame = np.zeros((height, width, 3), dtype=np.uint8)
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            cv2.putText(blank_frame, f"{self.title}", (width//4, height//2), font, 2, (255, 255, 255), 5, cv2.LINE_AA)
-            
             # Write frames
             for _ in range(fps * duration):
                 video.write(blank_frame)
@@ -512,23 +915,21 @@ class AsyncVideoGenerator:
                 
             # Get background music path
             try:
-                with open("download_list/background_music.txt", "r") as f:
-                    music_list = f.readlines()
-                    if music_list:
-                        import random
-                        background_music = random.choice(music_list).strip()
-                    else:
-                        background_music = None
+                music_list = _read_list_file("download_list/background_music.txt")
+                if music_list:
+                    background_music = random.choice(music_list)
+                else:
+                    background_music = None
             except Exception as e:
                 print(f"Error reading background music list: {e}")
                 background_music = None
                 
             # Create final video using existing mergevideo function
-            result = await asyncio.to_thread(
+            result = await self._run_io(
                 mergevideo, 
                 output_file, 
                 background_music, 
-                self.content.get("top10", []), 
+                [item.get("name", "") for item in self.content.get("top10", [])], 
                 self.title
             )
             
@@ -544,15 +945,12 @@ class AsyncVideoGenerator:
             str: Path to the final short video
         """
         try:
-            from moviepy.editor import VideoFileClip, concatenate_videoclips, AudioFileClip
-            from lib.shortcore import resize_and_text
-            
             output_file = "UnQTube_short.mp4"
             if os.path.exists('/content'):
                 output_file = os.path.join('/content', output_file)
                 
-            # Process each scene and prepare clips
-            clips = []
+            # Collect the scenes that have both video and audio
+            scenes = []
             scene_count = len(self.content.get("scenes", []))
             
             for i in range(scene_count):
@@ -563,21 +961,21 @@ class AsyncVideoGenerator:
                 if os.path.exists(video_file) and os.path.exists(audio_file):
                     # Create path without extension for resize_and_text
                     base_path = os.path.join(scene_dir, f"scene_{i+1}")
-                    
-                    # Create symlinks for compatibility with resize_and_text
-                    if not os.path.exists(f"{base_path}.mp4"):
-                        os.symlink(video_file, f"{base_path}.mp4")
-                    if not os.path.exists(f"{base_path}.mp3"):
-                        os.symlink(audio_file, f"{base_path}.mp3")
-                    
-                    # Use resize_and_text to process the clip
-                    clip = await asyncio.to_thread(resize_and_text, base_path)
-                    clips.append(clip)
+                    scenes.append((video_file, audio_file, base_path))
+            
+            # Create symlinks for compatibility with resize_and_text
+            await asyncio.gather(*(self._run_io(_link_scene, *scene) for scene in scenes))
+            
+            # Use resize_and_text to process all clips in parallel, keeping scene order
+            clips = list(await asyncio.gather(
+                *(self._run_io(resize_and_text, base_path) for _, _, base_path in scenes)
+            ))
             
             # If we have clips, merge them
             if clips:
                 final_clip = concatenate_videoclips(clips)
-                final_clip.write_videofile(output_file, codec='libx264', audio_codec='aac', fps=30)
+                # Encode off the event loop so other coroutines keep running
+                await self._run_io(_write_short_video, final_clip, output_file)
                 return output_file
             else:
                 raise ValueError("No valid clips to merge")
@@ -586,6 +984,56 @@ class AsyncVideoGenerator:
             print(f"Error merging short video: {e}")
             raise
 
+def _preload_tts():
+    """Import the Gemini TTS module ahead of time when it is enabled"""
+    if _cached_config().get('use_gemini', 'no').lower() in ['yes', 'true', '1']:
+        import lib.gemini_tts
+
+def _batch_mkdir(dirs):
+    """Create a batch of directories
+    
+    Args:
+        dirs (list): Directory paths to create
+    """
+    for directory in dirs:
+        os.makedirs(directory, exist_ok=True)
+
+def _copy_images(source_dir, output_dir):
+    """Copy a segment's processed images into another segment's folder
+    
+    Args:
+        source_dir (str): Folder with already processed images
+        output_dir (str): Folder to copy them into
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for file in os.listdir(source_dir):
+        if file.lower().endswith(('.png', '.jpg', '.jpeg')):
+            shutil.copy2(os.path.join(source_dir, file), os.path.join(output_dir, file))
+
+def _write_short_video(clip, output_file):
+    """Encode the final short video
+    
+    Args:
+        clip (VideoClip): The concatenated short video clip
+        output_file (str): Path to write the video to
+    """
+    clip.write_videofile(output_file, codec='libx264', audio_codec='aac', fps=30,
+                         threads=os.cpu_count(), preset='veryfast')
+
+def _link_scene(video_file, audio_file, base_path):
+    """Link a scene's video and audio to the names resize_and_text expects
+    
+    Args:
+        video_file (str): Path to the scene video
+        audio_file (str): Path to the scene audio
+        base_path (str): Path without extension for the links
+    """
+    # Absolute targets, since relative ones resolve from the link's folder
+    if not os.path.exists(f"{base_path}.mp4"):
+        os.symlink(os.path.abspath(video_file), f"{base_path}.mp4")
+    if not os.path.exists(f"{base_path}.mp3"):
+        os.symlink(os.path.abspath(audio_file), f"{base_path}.mp3")
+
 async def make_video_async(title, genre=""):
     """Main entry point for asynchronous video generation
     
@@ -596,17 +1044,21 @@ async def make_video_async(title, genre=""):
     Returns:
         str: Path to the generated video
     """
-    # Read config
+    # Read config fresh for this run; later lookups reuse it
+    _cached_config.cache_clear()
     try:
-        config = read_config_file()
-        language = config.get("language", "english")
+        language = _cached_config().get("language", "english")
     except Exception as e:
         print(f"Error reading config: {e}")
         language = "english"
         
     # Create generator and run
     generator = AsyncVideoGenerator(title, genre, language)
-    return await generator.generate_video()
+    try:
+        return await generator.generate_video()
+    finally:
+        await generator.aclose()
+        generator.close()
     
 async def make_short_video_async(topic, duration=30):
     """Main entry point for asynchronous short video generation
@@ -618,20 +1070,25 @@ async def make_short_video_async(topic, duration=30):
     Returns:
         str: Path to the generated short video
     """
-    # Read config
+    # Read config fresh for this run; later lookups reuse it
+    _cached_config.cache_clear()
     try:
-        config = read_config_file()
-        language = config.get("language", "english")
+        language = _cached_config().get("language", "english")
     except Exception as e:
         print(f"Error reading config: {e}")
         language = "english"
         
     # Create generator and run
     generator = AsyncVideoGenerator(topic, "", language)
-    return await generator.generate_short_video(duration)
+    try:
+        return await generator.generate_short_video(duration)
+    finally:
+        await generator.aclose()
+        generator.close()
     
 def cleanup():
-    """Clean up temporary files"""
+    """Clean up temporary files and worker processes"""
+    _shutdown_process_pool()
     try:
         temp_dir = get_temp_dir()
         if os.path.exists(temp_dir):
@@ -6,39 +6,130 @@ as well as managing the caching system for improved performance.
 """
 
 import os
+import atexit
 import json
 import time
 import pickle
 import hashlib
+import heapq
+import multiprocessing
 import random
+import re
+import tempfile
 import threading
-from functools import lru_cache
+import types
+from collections import OrderedDict
+from collections.abc import Mapping
 
-# Global cache for API responses
-_response_cache = {}
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+__all__ = [
+    "read_config_file",
+    "read_config_view",
+    "update_config_file",
+    "update_config_file_many",
+    "get_config_value",
+    "ConfigProxy",
+    "cache_response",
+    "get_cached_response",
+    "clear_cache",
+    "decorrelated_backoff",
+    "compute_rate_limit_backoff",
+    "intelligent_rate_limit_handling",
+    "should_throttle_request",
+    "handle_rate_limit_hit",
+    "record_rate_limit_headers",
+    "maybe_preemptive_wait",
+    "CircuitOpenError",
+    "check_circuit",
+    "release_circuit_probe",
+    "record_api_success",
+    "record_api_failure",
+    "reset_rate_limit_state",
+    "save_rate_limit_state",
+    "load_rate_limit_state",
+    "CacheManager",
+    "cache_manager",
+    "get_cache_manager",
+]
+
+# Global cache for API responses, bounded in size. Insertion order doubles as
+# eviction order, and a heap of (expires, key) lets expired entries be
+# dropped on write without scanning the whole cache
+_RESPONSE_CACHE_MAX = 4096
+_response_cache = OrderedDict()
+_response_expiry = []
 _cache_lock = threading.Lock()
 
-# Rate limiting state
+# Consecutive failures that open a circuit, and how long it stays open (seconds)
+_CIRCUIT_FAILURE_THRESHOLD = 5
+_CIRCUIT_COOLDOWN = 30
+# A half-open probe that never reports back (e.g. it was cancelled or got a
+# 4xx) stops blocking other callers after this many seconds
+_CIRCUIT_PROBE_TIMEOUT = 90
+
+# Rate limiting state. Requests are admitted by a token bucket that refills
+# at `rate` tokens per second up to `burst`; times are time.monotonic()
 _rate_limit_state = {
     "gemini_api": {
         "last_request_time": 0,
         "backoff_time": 0.5,  # Initial backoff in seconds
         "max_backoff": 30,    # Maximum backoff in seconds
-        "requests_count": 0,
-        "rate_limit_hit": False
+        "rate_limit_hit": False,
+        "rate": 2.0,          # Sustained requests per second
+        "burst": 5,           # Maximum requests allowed back to back
+        "tokens": 5.0,
+        "last_refill": 0,
+        # Circuit breaker: "closed", "open" or "half_open"
+        "cb_state": "closed",
+        "failures": 0,
+        "open_until": 0,
+        "probe_in_flight": False,
+        "probe_started": 0
     },
     "pexels_api": {
         "last_request_time": 0,
         "backoff_time": 0.5,
         "max_backoff": 15,
-        "requests_count": 0,
-        "rate_limit_hit": False
+        "rate_limit_hit": False,
+        "rate": 5.0,
+        "burst": 10,
+        "tokens": 10.0,
+        "last_refill": 0,
+        # Quota reported by the X-Ratelimit-* headers on every response
+        "limit": None,
+        "remaining": None,
+        "reset_at": 0
     }
 }
 _rate_limit_lock = threading.Lock()
 
-def read_config_file(filename="config.txt"):
-    """Read configuration from file
+# Backoff and circuit state is saved here so a restarted run keeps backing off
+# instead of hitting an API that was rate limiting it moments ago
+_RATE_STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "cache", "rate_state.json")
+_last_saved_rate_state = {}
+# Set when persisted fields change and cleared by a save, so exiting a run
+# that never touched an API does not rewrite the file
+_rate_state_dirty = False
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an API whose circuit breaker is open"""
+
+# Parsed config files keyed by absolute path, each stored with the
+# (mtime, size) it was read at so edits on disk are picked up on the next call
+_config_cache = {}
+
+# One `key = value` line; comments, blank lines and lines without '=' never match
+_CONFIG_LINE_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*$", re.M)
+
+def _load_config(filename):
+    """Return the cached parse of a config file, re-reading it if it changed
+    
+    The returned dict is shared with the cache and must not be modified.
     
     Args:
         filename (str): Path to the configuration file
@@ -46,51 +137,197 @@ def read_config_file(filename="config.txt"):
     Returns:
         dict: Configuration values as a dictionary
     """
+    path = os.path.abspath(filename)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _config_cache.pop(path, None)
+        return {}
+    
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
     config = {}
     try:
-        if os.path.exists(filename):
-            with open(filename, "r", encoding="utf-8") as file:
-        for line in file:
-                    line = line.strip()
-                    if line and "=" in line and not line.startswith("#"):
-                        key, value = line.split("=", 1)
-                config[key.strip()] = value.strip()
+        with open(path, "r", encoding="utf-8") as file:
+            config = dict(_CONFIG_LINE_RE.findall(file.read()))
+        _config_cache[path] = (stamp, config)
     except Exception as e:
         print(f"Error reading config file {filename}: {e}")
     return config
 
-def update_config_file(filename, key, value):
-    """Update a specific key in the configuration file
+def read_config_file(filename="config.txt"):
+    """Read configuration from file
+    
+    The parsed result is cached per file and only re-read when the file's
+    modification time or size changes.
     
     Args:
         filename (str): Path to the configuration file
-        key (str): Configuration key to update
-        value (str): New value for the key
+        
+    Returns:
+        dict: Configuration values as a dictionary
     """
-    config = read_config_file(filename)
-    config[key] = value
+    return dict(_load_config(filename))
+
+def read_config_view(filename="config.txt"):
+    """Read configuration from file as a shared, read-only mapping
     
-    try:
-        with open(filename, "w", encoding="utf-8") as file:
-            for k, v in config.items():
-                file.write(f"{k} = {v}\n")
-    except Exception as e:
-        print(f"Error updating config file {filename}: {e}")
+    Unlike read_config_file this does not copy the cached parse, so
+    repeated calls for an unchanged file return views of the same dict.
+    Call dict() on the result if a mutable copy is needed.
+    
+    Args:
+        filename (str): Path to the configuration file
+        
+    Returns:
+        types.MappingProxyType: Read-only view of the configuration values
+    """
+    return types.MappingProxyType(_load_config(filename))
 
-@lru_cache(maxsize=128)
-def get_cached_config(filename="config.txt"):
-    """Get cached configuration
+def get_config_value(key, default=None, filename="config.txt"):
+    """Look up a single configuration value
     
-    This function uses Python's lru_cache decorator to cache the configuration
-    and avoid repeated file reads.
+    Cheaper than read_config_file(...).get(key) since it reads from the
+    cached parse without copying the whole config.
     
     Args:
+        key (str): Configuration key to look up
+        default: Value returned when the key is not set
         filename (str): Path to the configuration file
         
     Returns:
-        dict: Configuration values as a dictionary
+        The configured value, or default if the key is missing
+    """
+    return _load_config(filename).get(key, default)
+
+class ConfigProxy(Mapping):
+    """Read-only view of a configuration file that always reflects the disk
+    
+    Lookups go straight to the cached parse of the file (re-read only when
+    it changes), so reading a single key doesn't copy the whole config the
+    way read_config_file does. Use dict(proxy) for a mutable snapshot.
     """
-    return read_config_file(filename)
+    
+    def __init__(self, filename="config.txt"):
+        """
+        Args:
+            filename (str): Path to the configuration file
+        """
+        self._filename = filename
+    
+    def __getitem__(self, key):
+        return _load_config(self._filename)[key]
+    
+    def __iter__(self):
+        return iter(_load_config(self._filename))
+    
+    def __len__(self):
+        return len(_load_config(self._filename))
+    
+    def __repr__(self):
+        return f"ConfigProxy({self._filename!r})"
+
+def update_config_file_many(filename, updates):
+    """Update several keys in the configuration file with a single rewrite
+    
+    Matching lines are rewritten in place, keeping comments and ordering;
+    every line for a key is rewritten, since the parser takes the last one.
+    Keys that are not present are appended. The file is replaced
+    atomically so readers never see a partial write, and is left alone
+    entirely when every key already has its new value.
+    
+    Args:
+        filename (str): Path to the configuration file
+        updates (dict): Configuration keys mapped to their new values
+    """
+    if not updates:
+        return
+    
+    values = {key: str(value) for key, value in updates.items()}
+    seen = set()
+    new_lines = []
+    changed = False
+    tmp_path = None
+    
+    try:
+        mode = 0o644
+        if os.path.exists(filename):
+            mode = os.stat(filename).st_mode & 0o777
+            with open(filename, "r", encoding="utf-8") as file:
+                for line in file:
+                    # Pass blank and comment lines straight through
+                    stripped = line.lstrip()
+                    if not stripped or stripped[0] == "#":
+                        new_lines.append(line)
+                        continue
+                    key, sep, current = line.partition("=")
+                    key = key.strip()
+                    if sep and key in values:
+                        seen.add(key)
+                        value = values[key]
+                        if current.strip() == value:
+                            new_lines.append(line)
+                        else:
+                            new_lines.append(f"{key} = {value}\n")
+                            changed = True
+                    else:
+                        new_lines.append(line)
+        
+        missing = [key for key in values if key not in seen]
+        if missing:
+            if new_lines and not new_lines[-1].endswith("\n"):
+                new_lines[-1] += "\n"
+            new_lines.extend(f"{key} = {values[key]}\n" for key in missing)
+            changed = True
+        
+        if not changed:
+            return
+        
+        # Write a temp file in the same directory, flush it to disk and rename
+        # it over the original, so a crash leaves either the old or new config
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), prefix=".cfg-")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write("".join(new_lines))
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, filename)
+        tmp_path = None
+    except Exception as e:
+        print(f"Error updating config file {filename}: {e}")
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    finally:
+        _config_cache.pop(os.path.abspath(filename), None)
+
+def update_config_file(filename, key, value):
+    """Update a specific key in the configuration file
+    
+    Args:
+        filename (str): Path to the configuration file
+        key (str): Configuration key to update
+        value (str): New value for the key
+    """
+    update_config_file_many(filename, {key: value})
+
+def _purge_expired_responses(now):
+    """Drop expired responses from the cache; caller must hold _cache_lock
+    
+    Args:
+        now (float): Current time
+    """
+    while _response_expiry and _response_expiry[0][0] <= now:
+        expires, key = heapq.heappop(_response_expiry)
+        entry = _response_cache.get(key)
+        # Skip heap entries left behind when a key was cached again
+        if entry is not None and entry["expires"] == expires:
+            del _response_cache[key]
 
 def cache_response(key, response, ttl=3600):
     """Cache an API response
@@ -100,11 +337,24 @@ def cache_response(key, response, ttl=3600):
         response: Response data to cache
         ttl (int): Time to live in seconds (default: 1 hour)
     """
+    now = time.time()
+    expires = now + ttl
     with _cache_lock:
+        _purge_expired_responses(now)
         _response_cache[key] = {
             "data": response,
-            "expires": time.time() + ttl
+            "expires": expires
         }
+        _response_cache.move_to_end(key)
+        heapq.heappush(_response_expiry, (expires, key))
+        
+        while len(_response_cache) > _RESPONSE_CACHE_MAX:
+            _response_cache.popitem(last=False)
+        
+        # Rebuild the heap once stale entries dominate it
+        if len(_response_expiry) > 2 * _RESPONSE_CACHE_MAX:
+            _response_expiry[:] = [(entry["expires"], k) for k, entry in _response_cache.items()]
+            heapq.heapify(_response_expiry)
 
 def get_cached_response(key):
     """Get a cached API response
@@ -116,8 +366,8 @@ def get_cached_response(key):
         The cached response or None if not found or expired
     """
     with _cache_lock:
-        if key in _response_cache:
-            cache_entry = _response_cache[key]
+        cache_entry = _response_cache.get(key)
+        if cache_entry is not None:
             if time.time() < cache_entry["expires"]:
                 return cache_entry["data"]
             else:
@@ -129,64 +379,92 @@ def clear_cache():
     """Clear all cached responses"""
     with _cache_lock:
         _response_cache.clear()
+        _response_expiry.clear()
 
-def intelligent_rate_limit_handling(retry_after=None, api_type=None):
-    """Handle rate limits intelligently with retry-after support
+def decorrelated_backoff(prev, base=1.0, cap=30.0):
+    """Pick the next retry delay using decorrelated jitter
     
-    This function implements a smart rate limiting strategy that:
-    1. Respects server-provided retry-after headers when available
-    2. Uses exponential backoff when no retry-after is provided
-    3. Adds jitter to prevent thundering herd problems
+    Each delay is drawn between `base` and three times the previous one, so
+    clients that failed together spread out instead of retrying in lockstep.
+    
+    Args:
+        prev (float): The previous delay in seconds
+        base (float): Minimum delay in seconds
+        cap (float): Maximum delay in seconds
+        
+    Returns:
+        float: The next delay in seconds
+    """
+    return min(cap, random.uniform(base, max(prev, base) * 3))
+
+def compute_rate_limit_backoff(retry_after=None, api_type=None):
+    """Work out how long to back off after a rate limit, without sleeping
+    
+    Records the hit in the API's rate limit state so the backoff carries
+    over to later calls. Async callers use this with asyncio.sleep.
     
     Args:
         retry_after (int): Retry-after value from API response header (seconds)
         api_type (str): API type identifier (e.g., 'gemini_api', 'pexels_api')
         
     Returns:
-        float: The actual sleep time used (seconds)
+        float: How long to wait in seconds
     """
-    # If no API type specified, use a default backoff
-    if not api_type:
-        sleep_time = retry_after if retry_after else random.uniform(1, 3)
-        time.sleep(sleep_time)
-        return sleep_time
-        
+    state = _rate_limit_state.get(api_type) if api_type else None
+    if state is None:
+        # Unknown API type, use simple backoff
+        if retry_after:
+            return retry_after
+        return random.uniform(1, 3) if not api_type else 1.0
+    
+    global _rate_state_dirty
     with _rate_limit_lock:
-        if api_type not in _rate_limit_state:
-            # Unknown API type, use simple backoff
-            sleep_time = retry_after if retry_after else 1.0
-            time.sleep(sleep_time)
-            return sleep_time
-            
-        state = _rate_limit_state[api_type]
+        _rate_state_dirty = True
         state["rate_limit_hit"] = True
+        state["last_request_time"] = time.monotonic()
         
         # If we have a retry-after header, use it (with small jitter)
         if retry_after:
             # Add small jitter (±10%) to avoid thundering herd
-            jitter_factor = random.uniform(0.9, 1.1)
-            sleep_time = retry_after * jitter_factor
+            sleep_time = retry_after * random.uniform(0.9, 1.1)
             
             # Update state to reflect this explicit backoff
             state["backoff_time"] = min(retry_after, state["max_backoff"])
         else:
-            # No retry-after, use exponential backoff
-            # Double the backoff time (with max limit)
-            state["backoff_time"] = min(state["backoff_time"] * 2, state["max_backoff"])
-            
-            # Add jitter (±20%) to avoid thundering herd
-            jitter_factor = random.uniform(0.8, 1.2)
-            sleep_time = state["backoff_time"] * jitter_factor
+            # No retry-after, grow the backoff with decorrelated jitter
+            sleep_time = decorrelated_backoff(state["backoff_time"], cap=state["max_backoff"])
+            state["backoff_time"] = sleep_time
+    
+    _maybe_save_rate_state(api_type)
+    return sleep_time
+
+def intelligent_rate_limit_handling(retry_after=None, api_type=None):
+    """Handle rate limits intelligently with retry-after support
+    
+    This function implements a smart rate limiting strategy that:
+    1. Respects server-provided retry-after headers when available
+    2. Uses decorrelated jitter backoff when no retry-after is provided
+    3. Shares backoff state per API so concurrent callers spread out
+    
+    Args:
+        retry_after (int): Retry-after value from API response header (seconds)
+        api_type (str): API type identifier (e.g., 'gemini_api', 'pexels_api')
         
-        # Sleep for the calculated time
+    Returns:
+        float: The actual sleep time used (seconds)
+    """
+    sleep_time = compute_rate_limit_backoff(retry_after, api_type)
+    if api_type in _rate_limit_state:
         print(f"Rate limit hit for {api_type}. Backing off for {sleep_time:.2f} seconds...")
-        time.sleep(sleep_time)
-        return sleep_time
+    time.sleep(sleep_time)
+    return sleep_time
 
 def should_throttle_request(api_type):
     """Check if a request should be throttled based on rate limits
     
-    This implements an exponential backoff strategy for rate limiting.
+    While a recent rate limit hit is backing off, requests are held for the
+    rest of the backoff window. Otherwise a token bucket smooths bursts to
+    the configured rate for the API.
     
     Args:
         api_type (str): API type (e.g., 'gemini_api', 'pexels_api')
@@ -194,42 +472,35 @@ def should_throttle_request(api_type):
     Returns:
         tuple: (should_throttle, wait_time) - whether to throttle and how long to wait
     """
+    state = _rate_limit_state.get(api_type)
+    if state is None:
+        return False, 0
+    
+    now = time.monotonic()
     with _rate_limit_lock:
-        if api_type not in _rate_limit_state:
-            return False, 0
-            
-        state = _rate_limit_state[api_type]
-        current_time = time.time()
-        elapsed = current_time - state["last_request_time"]
-        
-        # If we've hit a rate limit recently, use exponential backoff
+        # If we've hit a rate limit recently, wait out the backoff
         if state["rate_limit_hit"]:
+            elapsed = now - state["last_request_time"]
             if elapsed < state["backoff_time"]:
                 return True, state["backoff_time"] - elapsed
-            else:
-                # Reset rate limit hit flag but keep backoff time for next hit
-                state["rate_limit_hit"] = False
-        
-        # Simple request counting - if we're making too many requests in a short time
-        if state["requests_count"] > 10 and elapsed < 1.0:
-            # Add small jitter to avoid thundering herd
-            jitter = random.uniform(0.1, 0.5)
-            return True, 1.0 - elapsed + jitter
-            
-        # Update state
-        state["last_request_time"] = current_time
-        state["requests_count"] += 1
+            # Reset rate limit hit flag but keep backoff time for next hit
+            state["rate_limit_hit"] = False
         
-        # Reset request count periodically
-        if elapsed > 5.0:
-            state["requests_count"] = 1
-            
+        rate = state["rate"]
+        tokens = min(state["burst"], state["tokens"] + (now - state["last_refill"]) * rate)
+        state["last_refill"] = now
+        if tokens < 1:
+            state["tokens"] = tokens
+            return True, (1 - tokens) / rate
+        
+        state["tokens"] = tokens - 1
+        state["last_request_time"] = now
         return False, 0
 
 def handle_rate_limit_hit(api_type):
     """Handle a rate limit being hit
     
-    This increases the backoff time exponentially.
+    This grows the backoff time using decorrelated jitter.
     
     Args:
         api_type (str): API type (e.g., 'gemini_api', 'pexels_api')
@@ -237,21 +508,286 @@ def handle_rate_limit_hit(api_type):
     Returns:
         float: The new backoff time in seconds
     """
+    global _rate_state_dirty
     with _rate_limit_lock:
         if api_type not in _rate_limit_state:
             return 1.0
             
         state = _rate_limit_state[api_type]
+        _rate_state_dirty = True
         state["rate_limit_hit"] = True
+        state["last_request_time"] = time.monotonic()
         
-        # Increase backoff time exponentially
-        state["backoff_time"] = min(state["backoff_time"] * 2, state["max_backoff"])
+        # Grow the backoff with decorrelated jitter so clients retry apart
+        state["backoff_time"] = decorrelated_backoff(state["backoff_time"], cap=state["max_backoff"])
+        backoff_time = state["backoff_time"]
+    
+    _maybe_save_rate_state(api_type)
+    return backoff_time
+
+def record_rate_limit_headers(api_type, headers):
+    """Remember the quota an API reported in its rate limit headers
+    
+    Args:
+        api_type (str): API type (e.g., 'pexels_api')
+        headers: Response headers (case-insensitive mapping)
+    """
+    state = _rate_limit_state.get(api_type)
+    if state is None or "remaining" not in state:
+        return
+    
+    try:
+        remaining = headers.get("X-Ratelimit-Remaining")
+        if remaining is None:
+            return
+        limit = headers.get("X-Ratelimit-Limit")
+        reset = headers.get("X-Ratelimit-Reset")
+        reset_at = time.monotonic() + max(0.0, float(reset) - time.time()) if reset else 0
+        global _rate_state_dirty
+        with _rate_limit_lock:
+            _rate_state_dirty = True
+            state["remaining"] = int(remaining)
+            state["limit"] = int(limit) if limit else None
+            state["reset_at"] = reset_at
+    except (TypeError, ValueError):
+        pass
+
+def maybe_preemptive_wait(api_type):
+    """Wait before a request when the reported quota is nearly used up
+    
+    When the last response said at most 10% of the quota (or 2 requests) is
+    left, sleep until the quota resets instead of running into a 429. The
+    wait is capped at the API's max_backoff.
+    
+    Args:
+        api_type (str): API type (e.g., 'pexels_api')
         
-        # Add small random jitter to avoid all clients retrying at the same time
-        jitter = random.uniform(0, 0.5)
-        backoff_with_jitter = state["backoff_time"] + jitter
+    Returns:
+        float: The time slept in seconds
+    """
+    state = _rate_limit_state.get(api_type)
+    if state is None or state.get("remaining") is None:
+        return 0
+    
+    with _rate_limit_lock:
+        floor = max(2, 0.1 * state["limit"]) if state["limit"] else 2
+        if state["remaining"] > floor:
+            return 0
+        wait_time = min(state["reset_at"] - time.monotonic(), state["max_backoff"])
+    
+    if wait_time <= 0:
+        return 0
+    print(f"{api_type} quota nearly used up ({state['remaining']} left). Waiting {wait_time:.2f} seconds...")
+    time.sleep(wait_time)
+    return wait_time
+
+def check_circuit(api_type):
+    """Fail fast if the API's circuit breaker is open
+    
+    Once the cooldown has passed the circuit goes half-open and a single
+    request is let through as a probe; other callers keep failing fast
+    until the probe finishes. The caller that gets the probe must pass the
+    returned token to release_circuit_probe once its response is handled,
+    whatever the outcome.
+    
+    Args:
+        api_type (str): API type (e.g., 'gemini_api')
         
-        return backoff_with_jitter
+    Returns:
+        float: Probe token if this call is the half-open probe, else None
+        
+    Raises:
+        CircuitOpenError: If the circuit is open and still cooling down
+    """
+    state = _rate_limit_state.get(api_type)
+    if state is None or "cb_state" not in state or state["cb_state"] == "closed":
+        return None
+    
+    now = time.monotonic()
+    with _rate_limit_lock:
+        if state["cb_state"] == "open":
+            if now < state["open_until"]:
+                raise CircuitOpenError(
+                    f"{api_type} circuit is open after repeated failures; "
+                    f"retry in {state['open_until'] - now:.0f} seconds"
+                )
+            state["cb_state"] = "half_open"
+        elif state["probe_in_flight"] and now - state["probe_started"] < _CIRCUIT_PROBE_TIMEOUT:
+            raise CircuitOpenError(
+                f"{api_type} circuit is half-open; waiting for the probe request to finish"
+            )
+        state["probe_in_flight"] = True
+        state["probe_started"] = now
+    return now
+
+def release_circuit_probe(api_type, probe):
+    """Free the half-open probe slot taken by check_circuit
+    
+    Covers outcomes that neither record a success nor a failure, such as a
+    400, a 429 or an unreadable body, so other callers are not held off
+    until _CIRCUIT_PROBE_TIMEOUT expires.
+    
+    Args:
+        api_type (str): API type (e.g., 'gemini_api')
+        probe (float): Token returned by check_circuit, or None
+    """
+    state = _rate_limit_state.get(api_type)
+    if probe is None or state is None:
+        return
+    with _rate_limit_lock:
+        if state["probe_in_flight"] and state["probe_started"] == probe:
+            state["probe_in_flight"] = False
+
+def record_api_success(api_type):
+    """Close the API's circuit breaker after a successful call
+    
+    Args:
+        api_type (str): API type (e.g., 'gemini_api')
+    """
+    state = _rate_limit_state.get(api_type)
+    if state is None or "cb_state" not in state:
+        return
+    global _rate_state_dirty
+    with _rate_limit_lock:
+        if state["failures"] or state["cb_state"] != "closed":
+            _rate_state_dirty = True
+        state["failures"] = 0
+        state["cb_state"] = "closed"
+        state["probe_in_flight"] = False
+
+def record_api_failure(api_type):
+    """Count a server error or timeout, opening the circuit when needed
+    
+    The circuit opens after _CIRCUIT_FAILURE_THRESHOLD consecutive
+    failures, or straight away if a half-open probe fails.
+    
+    Args:
+        api_type (str): API type (e.g., 'gemini_api')
+    """
+    state = _rate_limit_state.get(api_type)
+    if state is None or "cb_state" not in state:
+        return
+    global _rate_state_dirty
+    with _rate_limit_lock:
+        _rate_state_dirty = True
+        state["failures"] += 1
+        state["probe_in_flight"] = False
+        if state["cb_state"] == "half_open" or state["failures"] >= _CIRCUIT_FAILURE_THRESHOLD:
+            state["cb_state"] = "open"
+            state["open_until"] = time.monotonic() + _CIRCUIT_COOLDOWN
+            print(f"{api_type} failing repeatedly; pausing requests for {_CIRCUIT_COOLDOWN} seconds")
+    _maybe_save_rate_state(api_type)
+
+def _rate_state_snapshot():
+    """Build a JSON-safe copy of the rate limit state; caller must hold _rate_limit_lock
+    
+    Monotonic deadlines are converted to wall-clock times so they still
+    mean something in the next process.
+    
+    Returns:
+        dict: Persisted fields per API type
+    """
+    to_wall = time.time() - time.monotonic()
+    snapshot = {}
+    for api, state in _rate_limit_state.items():
+        entry = {"backoff_time": state["backoff_time"]}
+        if state["rate_limit_hit"]:
+            entry["backoff_until"] = state["last_request_time"] + state["backoff_time"] + to_wall
+        if "cb_state" in state:
+            entry["failures"] = state["failures"]
+            if state["cb_state"] == "open":
+                entry["open_until"] = state["open_until"] + to_wall
+        if state.get("remaining") is not None:
+            entry["limit"] = state["limit"]
+            entry["remaining"] = state["remaining"]
+            entry["reset_at"] = state["reset_at"] + to_wall
+        snapshot[api] = entry
+    return snapshot
+
+def save_rate_limit_state():
+    """Write the rate limit state to disk so the next run can pick it up"""
+    global _rate_state_dirty
+    with _rate_limit_lock:
+        snapshot = _rate_state_snapshot()
+        _rate_state_dirty = False
+    
+    try:
+        os.makedirs(os.path.dirname(_RATE_STATE_FILE), exist_ok=True)
+        tmp_path = f"{_RATE_STATE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file)
+        os.replace(tmp_path, _RATE_STATE_FILE)
+    except OSError as e:
+        _rate_state_dirty = True
+        print(f"Error saving rate limit state: {e}")
+
+def _save_rate_state_at_exit():
+    """Save the rate limit state on exit if it changed during this run
+    
+    Worker processes never save, since only the main process talks to the
+    APIs and its state is the one worth keeping.
+    """
+    if _rate_state_dirty and multiprocessing.parent_process() is None:
+        save_rate_limit_state()
+
+def load_rate_limit_state():
+    """Restore rate limit state saved by a previous run
+    
+    Deadlines that have already passed are dropped.
+    """
+    try:
+        with open(_RATE_STATE_FILE, "r", encoding="utf-8") as file:
+            saved = json.load(file)
+    except (OSError, ValueError):
+        return
+    
+    now_wall = time.time()
+    to_mono = time.monotonic() - now_wall
+    with _rate_limit_lock:
+        for api, entry in saved.items():
+            state = _rate_limit_state.get(api)
+            if state is None or not isinstance(entry, dict):
+                continue
+            try:
+                state["backoff_time"] = min(float(entry["backoff_time"]), state["max_backoff"])
+                if entry.get("backoff_until", 0) > now_wall:
+                    state["rate_limit_hit"] = True
+                    state["last_request_time"] = entry["backoff_until"] + to_mono - state["backoff_time"]
+                if "cb_state" in state:
+                    state["failures"] = int(entry.get("failures", 0))
+                    if entry.get("open_until", 0) > now_wall:
+                        state["cb_state"] = "open"
+                        state["open_until"] = entry["open_until"] + to_mono
+                if "remaining" in state and entry.get("reset_at", 0) > now_wall:
+                    state["limit"] = entry["limit"]
+                    state["remaining"] = int(entry["remaining"])
+                    state["reset_at"] = entry["reset_at"] + to_mono
+            except (KeyError, TypeError, ValueError):
+                continue
+        _last_saved_rate_state.update(
+            (api, (state["backoff_time"], state.get("cb_state"))) for api, state in _rate_limit_state.items()
+        )
+
+def _maybe_save_rate_state(api_type):
+    """Write the state through to disk if this API's backoff moved enough
+    
+    Saves when the circuit state changed or the backoff time moved by more
+    than 10% since the last save, which keeps file writes rare.
+    
+    Args:
+        api_type (str): API type whose state just changed
+    """
+    state = _rate_limit_state.get(api_type)
+    if state is None:
+        return
+    
+    with _rate_limit_lock:
+        current = (state["backoff_time"], state.get("cb_state"))
+        last = _last_saved_rate_state.get(api_type)
+        if last is not None and last[1] == current[1] and abs(current[0] - last[0]) <= 0.1 * last[0]:
+            return
+        _last_saved_rate_state[api_type] = current
+    save_rate_limit_state()
 
 def reset_rate_limit_state(api_type=None):
     """Reset rate limit state
@@ -259,24 +795,38 @@ def reset_rate_limit_state(api_type=None):
     Args:
         api_type (str, optional): API type to reset. If None, reset all.
     """
+    global _rate_state_dirty
     with _rate_limit_lock:
+        _rate_state_dirty = True
         if api_type is None:
             # Reset all API states
             for api in _rate_limit_state:
                 _rate_limit_state[api].update({
                     "last_request_time": 0,
                     "backoff_time": 0.5,
-                    "requests_count": 0,
-                    "rate_limit_hit": False
+                    "rate_limit_hit": False,
+                    "tokens": float(_rate_limit_state[api]["burst"]),
+                    "last_refill": 0
                 })
+                if "cb_state" in _rate_limit_state[api]:
+                    _rate_limit_state[api].update({"cb_state": "closed", "failures": 0, "open_until": 0, "probe_in_flight": False})
         elif api_type in _rate_limit_state:
             # Reset specific API state
             _rate_limit_state[api_type].update({
                 "last_request_time": 0,
                 "backoff_time": 0.5,
-                "requests_count": 0,
-                "rate_limit_hit": False
+                "rate_limit_hit": False,
+                "tokens": float(_rate_limit_state[api_type]["burst"]),
+                "last_refill": 0
             })
+            if "cb_state" in _rate_limit_state[api_type]:
+                _rate_limit_state[api_type].update({"cb_state": "closed", "failures": 0, "open_until": 0, "probe_in_flight": False})
+
+# Cache files starting with this header hold an lz4-compressed pickle; anything
+# else is a plain pickle, so entries written without lz4 stay readable
+_LZ4_MAGIC = b"LZ4P"
+# Pickles smaller than this are stored uncompressed
+_COMPRESS_MIN_BYTES = 4096
 
 class CacheManager:
     """
@@ -295,6 +845,16 @@ class CacheManager:
         self.cache_dir = cache_dir or 'cache'
         self.max_age = max_age
         
+        # In-process LRU of recently used entries, keyed by (category, cache_key)
+        # and holding (stored_at, pickled value), so hot lookups skip the disk;
+        # each hit unpickles a fresh copy so callers can't mutate a shared object
+        self._mem = OrderedDict()
+        self._mem_cap = 1024
+        self._mem_lock = threading.Lock()
+        
+        # Category directories already created by this instance
+        self._known_dirs = set()
+        
         # Create cache directory if it doesn't exist
         os.makedirs(self.cache_dir, exist_ok=True)
     
@@ -309,16 +869,24 @@ class CacheManager:
             str: A string representation of the cache key.
         """
         if isinstance(key_data, str):
-            data_str = key_data
+            data = key_data.encode('utf-8')
+        elif isinstance(key_data, bytes):
+            data = key_data
         elif isinstance(key_data, dict):
-            # Sort dictionary to ensure consistent hashing
-            data_str = json.dumps(key_data, sort_keys=True)
+            # Sort items so insertion order doesn't change the key; pickling
+            # is much cheaper than JSON for large prompt payloads
+            try:
+                items = sorted(key_data.items())
+            except TypeError:
+                # Keys of mixed types can't be ordered against each other
+                items = sorted(key_data.items(), key=lambda item: repr(item[0]))
+            data = pickle.dumps(items, protocol=5)
         elif isinstance(key_data, list) or isinstance(key_data, tuple):
-            data_str = json.dumps(list(key_data))
+            data = pickle.dumps(list(key_data), protocol=5)
         else:
-            data_str = str(key_data)
+            data = str(key_data).encode('utf-8')
             
-        return hashlib.md5(data_str.encode('utf-8')).hexdigest()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
     
     def _get_cache_path(self, cache_key, category=None):
         """
@@ -333,11 +901,48 @@ class CacheManager:
         """
         if category:
             category_dir = os.path.join(self.cache_dir, category)
-            os.makedirs(category_dir, exist_ok=True)
+            if category not in self._known_dirs:
+                os.makedirs(category_dir, exist_ok=True)
+                self._known_dirs.add(category)
             return os.path.join(category_dir, f"{cache_key}.cache")
         else:
             return os.path.join(self.cache_dir, f"{cache_key}.cache")
     
+    def _mem_get(self, mem_key):
+        """
+        Look up an entry in the in-process LRU.
+        
+        Args:
+            mem_key: The (category, cache_key) tuple for the entry.
+            
+        Returns:
+            bytes: The pickled value, or None if it is missing or has expired.
+        """
+        with self._mem_lock:
+            entry = self._mem.get(mem_key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.max_age:
+                del self._mem[mem_key]
+                return None
+            self._mem.move_to_end(mem_key)
+            return entry[1]
+    
+    def _mem_put(self, mem_key, data, stored_at):
+        """
+        Insert an entry into the in-process LRU, evicting the oldest if full.
+        
+        Args:
+            mem_key: The (category, cache_key) tuple for the entry.
+            data (bytes): Uncompressed pickle of the value.
+            stored_at: Time the value was written, used for expiry.
+        """
+        with self._mem_lock:
+            self._mem[mem_key] = (stored_at, data)
+            self._mem.move_to_end(mem_key)
+            if len(self._mem) > self._mem_cap:
+                self._mem.popitem(last=False)
+    
     def get(self, key_data, category=None):
         """
         Get a value from the cache.
@@ -350,20 +955,32 @@ class CacheManager:
             The cached value, or None if the key is not in the cache or the entry has expired.
         """
         cache_key = self._get_cache_key(key_data)
+        mem_key = (category, cache_key)
+        data = self._mem_get(mem_key)
+        if data is not None:
+            return pickle.loads(data)
+        
         cache_path = self._get_cache_path(cache_key, category)
         
         try:
             # Check if cache file exists and is not expired
             if os.path.exists(cache_path):
-                file_age = time.time() - os.path.getmtime(cache_path)
+                mtime = os.path.getmtime(cache_path)
                 
                 # Return None if the cache entry has expired
-                if file_age > self.max_age:
+                if time.time() - mtime > self.max_age:
                     return None
                 
                 # Read the cache entry
                 with open(cache_path, 'rb') as f:
-                    return pickle.load(f)
+                    data = f.read()
+                if data.startswith(_LZ4_MAGIC):
+                    if lz4 is None:
+                        return None
+                    data = lz4.frame.decompress(data[len(_LZ4_MAGIC):])
+                value = pickle.loads(data)
+                self._mem_put(mem_key, data, mtime)
+                return value
         except Exception as e:
             print(f"Error reading cache entry: {e}")
             
@@ -384,13 +1001,33 @@ class CacheManager:
         cache_key = self._get_cache_key(key_data)
         cache_path = self._get_cache_path(cache_key, category)
         
+        # Write to a temp file and move it into place so a crash mid-write
+        # never leaves a truncated entry behind; no fsync, losing cache is fine
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            # Write the cache entry
-            with open(cache_path, 'wb') as f:
-                pickle.dump(value, f)
+            pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            try:
+                f = open(tmp_path, 'wb')
+            except FileNotFoundError:
+                # Category directory was removed since it was created
+                self._known_dirs.discard(category)
+                cache_path = self._get_cache_path(cache_key, category)
+                f = open(tmp_path, 'wb')
+            with f:
+                data = pickled
+                if lz4 is not None and len(data) >= _COMPRESS_MIN_BYTES:
+                    f.write(_LZ4_MAGIC)
+                    data = lz4.frame.compress(data)
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+            self._mem_put((category, cache_key), pickled, time.time())
             return True
         except Exception as e:
             print(f"Error writing cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
             return False
     
     def clear(self, category=None, max_age=None):
@@ -404,6 +1041,13 @@ class CacheManager:
         """
         max_age = max_age or self.max_age
         
+        cutoff = time.time() - max_age
+        with self._mem_lock:
+            expired = [k for k, (stored_at, _) in self._mem.items()
+                       if stored_at < cutoff and (category is None or k[0] == category)]
+            for k in expired:
+                del self._mem[k]
+        
         try:
             if category:
                 # Clear expired entries in a specific category
@@ -415,10 +1059,10 @@ class CacheManager:
                 self._clear_dir(self.cache_dir, max_age)
                 
                 # Also clear subdirectories
-                for item in os.listdir(self.cache_dir):
-                    item_path = os.path.join(self.cache_dir, item)
-                    if os.path.isdir(item_path):
-                        self._clear_dir(item_path, max_age)
+                with os.scandir(self.cache_dir) as entries:
+                    subdirs = [e.path for e in entries if e.is_dir(follow_symlinks=False)]
+                for subdir in subdirs:
+                    self._clear_dir(subdir, max_age)
         except Exception as e:
             print(f"Error clearing cache: {e}")
     
@@ -432,17 +1076,20 @@ class CacheManager:
         """
         current_time = time.time()
         
-        for item in os.listdir(directory):
-            if item.endswith('.cache'):
-                item_path = os.path.join(directory, item)
-                file_age = current_time - os.path.getmtime(item_path)
-                
-                # Delete the file if it has expired
-                if file_age > max_age:
-                    try:
-                        os.remove(item_path)
-                    except Exception as e:
-                        print(f"Error removing cache file {item}: {e}")
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.cache'):
+                    continue
+                try:
+                    # Delete the file if it has expired
+                    if current_time - entry.stat().st_mtime > max_age:
+                        os.unlink(entry.path)
+                except Exception as e:
+                    print(f"Error removing cache file {entry.name}: {e}")
+
+# Pick up backoff state from the previous run and save it on exit if it changed
+load_rate_limit_state()
+atexit.register(_save_rate_state_at_exit)
 
 # Create a global instance of the cache manager
 cache_manager = CacheManager()
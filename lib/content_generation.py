@@ -6,16 +6,685 @@ multi-step prompt chains and sophisticated AI interactions.
 """
 
 import os
+import re
+import sys
 import json
 import asyncio
+import logging
+import copy
 import time
-from lib.gemini_api import generate_script_with_gemini
+from functools import lru_cache
+from lib.gemini_api import agenerate_script_with_gemini, astream_script_with_gemini, GEMINI_MODEL_ID
+from lib import prompt_cache
+from lib import local_llm
 from lib.media_api import translateto
 from lib.language import get_language_code
-from lib.config_utils import read_config_file
+from lib.config_utils import decorrelated_backoff
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from json_repair import repair_json
+except ImportError:
+    repair_json = None
 
 # Using Google Gemini API for content generation
 
+logger = logging.getLogger("UnQTube.content_generation")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler that always writes to the current sys.stdout
+
+    rungui captures generation output with redirect_stdout, so the stream
+    has to be looked up when a record is written, not when the handler
+    is created.
+    """
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _setup_logging():
+    """Write this module's progress messages to stdout
+
+    Records are written synchronously on the calling thread, so they stay
+    in order with the print() output of the rest of the pipeline and land
+    inside any redirect_stdout that is active when they are logged.
+    """
+    if logger.handlers:
+        return
+    console_handler = _StdoutHandler()
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+_setup_logging()
+
+# Patterns used to pull JSON out of model responses, compiled once
+_JSON_STR_ARR_RE = re.compile(r'\[\s*".*"\s*\]', re.DOTALL)
+_JSON_ARR_RE = re.compile(r'\[[\s\S]*?\]')
+_QUOTED_STR_RE = re.compile(r'"([^"]*)"')
+_NUM_BULLET_RE = re.compile(r'^(?:\d+[.)]?|[-*\u2022])\s+(.+)$')
+_UNQUOTED_KEY_RE = re.compile(r'([{,]\s*)([A-Za-z_]\w*)(\s*:)')
+_NUMBER_PREFIX_RE = re.compile(r'^[*\s]*(?:#(10|[1-9])\b|(10|[1-9])[.:])')
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_LINE_COMMENT_RE = re.compile(r'^\s*//.*$', re.M)
+# Countdown section headings in a generated script ("#10: ...", "**#9**")
+_ITEM_HEADING_RE = re.compile(r'^[*#\s]*#(10|[1-9])\b', re.M)
+
+# Prompt templates, filled with str.format_map(_SafeDict(...)); literal
+# braces in the JSON examples are doubled
+_PROMPTS = {
+    "research": """
+You're a professional researcher gathering key information about {title}.
+
+Provide comprehensive background information including:
+1. What exactly is {title}? Provide a clear definition.
+2. Historical context and development
+3. Key facts, statistics, or notable features
+4. Why this topic is interesting or important
+5. Current trends or developments related to {title}
+
+For a top 10 video about {title}, what are the most important pieces of information
+that would make the content factually accurate and interesting to viewers?
+
+Focus on providing factual, detailed information rather than just opinions.
+
+Format your response as paragraphs of factual information, not as a script.
+""",
+    "research_context": """
+Based on this research information:
+{research}
+""",
+    "outline": """
+You're a top-tier YouTube content strategist creating an engaging outline for a video about {title}.
+{research_context}
+
+Create a compelling video outline with:
+1. An attention-grabbing hook for the first 15 seconds
+2. A clear thesis statement explaining what viewers will learn
+3. 10 main points/items about {title}, organized in logical progression
+4. For each of the 10 points, include:
+   - A concise headline
+   - Key supporting details/facts
+   - Potential visual elements that would enhance this section
+5. A conclusion with a thought-provoking question and clear call-to-action
+
+Format as structured JSON with the following format:
+{{
+  "hook": "Opening hook text here",
+  "thesis": "Main thesis statement",
+  "items": [
+    {{
+      "rank": 10,
+      "title": "Item title",
+      "description": "Description with key points",
+      "visuals": ["visual element 1", "visual element 2"]
+    }},
+    // ... 9 more items in descending order (10, 9, 8...)
+  ],
+  "conclusion": "Conclusion text with call to action"
+}}
+
+The 10 items should be in descending order, starting with #10 and ending with #1 (the best).
+""",
+    "script": """
+You are an expert YouTube scriptwriter creating a professional script for a top 10 video about {title}.
+
+Use this outline to create a complete, detailed script:
+
+HOOK: {hook}
+
+THESIS: {thesis}
+
+ITEMS:
+{items}
+CONCLUSION: {conclusion}
+
+For each section, write natural, engaging content that:
+1. Uses conversational language and a friendly tone
+2. Includes interesting facts and details to educate viewers
+3. Uses transitions between sections
+4. Includes occasional questions or statements that directly engage the audience
+5. For the top items (#3, #2, #1), builds excitement and anticipation
+
+Format the script with clear section headers (INTRO, #10, #9... etc., CONCLUSION) 
+and make the content flow naturally between sections.
+
+The entire script should be comprehensive, with at least 150-200 words for each of the top 10 items.
+Return AT LEAST 2000 words. If you approach the token limit, prioritize completing all 10 items over depth on any single item.
+""",
+    "script_item": """
+#{rank}: {item_title}
+Details: {description}
+
+""",
+    "expand": """
+The following script for a video about {title} needs to be expanded with more detail,
+examples, and engaging content:
+
+{initial_script}
+
+Please expand this script to make it more comprehensive and engaging:
+1. Add more specific details, examples, and facts for each section
+2. Include more descriptive language and vivid imagery
+3. Add rhetorical questions and calls for audience engagement
+4. Make sure each of the top 10 items has at least 150-200 words of content
+5. Ensure smooth transitions between sections
+
+Provide the complete expanded script while maintaining the original structure and key points.
+""",
+    "hooks_and_terms": """
+You're preparing a top 10 YouTube video about {title} (genre: {genre}).
+
+Outline items: {titles}
+
+Produce two things:
+
+1. Compelling, attention-grabbing hooks, using curiosity gaps, powerful statistics,
+   provocative questions, or bold claims:
+   - opening_hook (first 5 seconds): stops scrolling viewers
+   - intro_hook (15-20 seconds in): makes viewers want to see the full countdown
+   - midpoint_hook (for item #5): builds anticipation for the top items
+   - finale_hook (before item #1): creates maximum anticipation for the #1 spot
+   - subscription_hook (outro): a compelling reason to subscribe
+
+2. 20 highly specific, visually descriptive search terms for stock footage or images
+   that would accompany this content. Be precise about what should be shown and
+   include camera angle, lighting or composition where useful.
+
+Format your response ONLY as JSON with the following structure:
+{{
+  "hooks": {{
+    "opening_hook": "Hook text here",
+    "intro_hook": "Hook text here",
+    "midpoint_hook": "Hook text here",
+    "finale_hook": "Hook text here",
+    "subscription_hook": "Hook text here"
+  }},
+  "search_terms": ["aerial view of modern Tokyo skyline at sunset", "..."]
+}}
+""",
+    "hooks": """
+Create compelling, attention-grabbing hooks for a YouTube video about {title}.
+
+For each hook type, create a script segment that will immediately capture viewer attention:
+
+1. OPENING HOOK (first 5 seconds): A powerful statement or question that stops scrolling viewers
+2. INTRO HOOK (15-20 seconds in): An intriguing fact or statement that makes viewers want to see the full countdown
+3. MIDPOINT HOOK (for item #5): A statement that builds anticipation for the top items
+4. FINALE HOOK (before item #1): A statement that creates maximum anticipation for the #1 spot
+5. SUBSCRIPTION HOOK (outro): A compelling reason for viewers to subscribe
+
+For each hook, use psychological techniques like curiosity gaps, powerful statistics,
+provocative questions, or bold claims that create emotional engagement.
+
+Format your response as JSON with the following structure:
+{{
+  "opening_hook": "Hook text here",
+  "intro_hook": "Hook text here",
+  "midpoint_hook": "Hook text here",
+  "finale_hook": "Hook text here",
+  "subscription_hook": "Hook text here"
+}}
+""",
+    "search_terms": """
+Based on this video content about {title}:
+
+{content}
+
+Generate {count} highly specific, visually descriptive search terms for finding
+stock footage or images that would perfectly accompany this content.
+
+For each search term:
+1. Be extremely specific and visually detailed
+2. Include suggestions for camera angles, lighting, or composition
+3. Focus on dynamic, high-quality visuals that would engage viewers
+4. Avoid generic terms - be precise about what should be shown
+
+Format your response ONLY as a JSON array of strings with the search terms.
+Example: ["aerial view of modern Tokyo skyline at sunset", "close-up of gaming controller with neon lighting"]
+""",
+    "short_outline": """
+Create an engaging outline for a 30-60 second short vertical video about {title}.
+
+The outline should include:
+1. An attention-grabbing hook (first 3 seconds)
+2. 3-5 key points that can be covered in a very brief format
+3. A strong call-to-action
+
+Format as structured JSON with the following format:
+{{
+  "hook": "Opening hook text here",
+  "points": [
+    {{
+      "title": "Point title",
+      "content": "Brief point content"
+    }},
+    // ... more points
+  ],
+  "call_to_action": "CTA text here"
+}}
+
+Remember this is for a SHORT video (30-60 seconds), so content must be concise and impactful.
+""",
+    "short_script": """
+You are an expert creating viral short-form video scripts (30-60 seconds) about {title}.
+
+Use this outline to create a complete, engaging script for a vertical video:
+
+HOOK: {hook}
+
+POINTS:
+{points}
+CALL TO ACTION: {call_to_action}
+
+Write a natural, engaging script that:
+1. Uses short, punchy sentences ideal for short-form video
+2. Includes visual direction notes for each section [in brackets]
+3. Times out to approximately 30-60 seconds when read at normal pace
+4. Uses hooks, patterns interrupts, and questions to maintain viewer attention
+5. Has a clear structure: Hook → Points → Call to action
+
+Format the final script with clear section breaks and include approximate timing for each section.
+""",
+    "short_script_point": """
+- {point_title}: {point_content}
+""",
+}
+
+
+class _SafeDict(dict):
+    """Mapping for str.format_map that renders missing fields as empty strings"""
+
+    def __missing__(self, key):
+        return ""
+
+# How much of the generated script is quoted back in follow-up prompts
+_SCRIPT_EXCERPT_CHARS = 2500
+
+# Characters a finished script can end on; anything else means the model
+# stopped mid-sentence
+_SCRIPT_ENDINGS = ('.', '!', '?', '"', "'", ')', ']', '*')
+
+
+def _script_looks_truncated(script, item_count):
+    """Check whether a generated script was cut off before it finished
+
+    The script counts as complete when it ends on a finished sentence and
+    has a heading for every outline item; the wording of the closing
+    section does not matter.
+
+    Args:
+        script (str): The generated script
+        item_count (int): Number of items in the outline
+
+    Returns:
+        bool: True if the script should be expanded
+    """
+    tail = script.rstrip()
+    if not tail or tail.endswith("...") or not tail.endswith(_SCRIPT_ENDINGS):
+        return True
+    return len(set(_ITEM_HEADING_RE.findall(script))) < min(item_count, 10)
+
+
+def _json_loads(text):
+    """Parse JSON text, using orjson when it is installed
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(obj):
+    """Serialize an object to a compact JSON string"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _repair_json(text):
+    """Fix the usual ways model output falls short of strict JSON
+
+    Uses json_repair when it is installed. Otherwise drops // comment lines
+    and trailing commas, quotes bare keys, and swaps single quotes for
+    double quotes only when the text has no double quotes at all, so
+    apostrophes inside proper JSON strings are left alone.
+
+    Args:
+        text (str): Almost-JSON text from the model
+
+    Returns:
+        str: Text that is more likely to parse as JSON
+    """
+    if repair_json is not None:
+        return repair_json(text)
+    if '"' not in text:
+        text = text.replace("'", '"')
+    text = _LINE_COMMENT_RE.sub('', text)
+    text = _TRAILING_COMMA_RE.sub(r'\1', text)
+    return _UNQUOTED_KEY_RE.sub(r'\1"\2"\3', text)
+
+
+def _loads_lenient(candidate):
+    """Parse JSON strictly, then once more after _repair_json
+
+    Returns:
+        The decoded value, or None if neither attempt parses
+    """
+    try:
+        return _json_loads(candidate)
+    except json.JSONDecodeError:
+        try:
+            return _json_loads(_repair_json(candidate))
+        except json.JSONDecodeError:
+            return None
+
+
+def _iter_json_objects(text):
+    """Yield each outermost brace-balanced span in the text, left to right
+
+    A single linear scan that tracks open braces and ignores braces inside
+    double-quoted strings, so it returns the exact object rather than the
+    widest brace-to-brace span and never backtracks on long responses. A
+    brace that never closes (stray prose like "use {braces" or a truncated
+    response) does not hide the complete objects after it.
+
+    Args:
+        text (str): Raw model response
+
+    Yields:
+        str: Candidate JSON object text
+    """
+    opens = []
+    # Objects that closed while an enclosing brace was still open
+    nested = []
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = bool(opens)
+        elif ch == "{":
+            opens.append(i)
+        elif ch == "}" and opens:
+            start = opens.pop()
+            if opens:
+                nested.append((start, i + 1))
+            else:
+                nested.clear()
+                yield text[start:i + 1]
+
+    # Whatever is still open never closed; offer the outermost objects that
+    # did close inside it, in order
+    last_end = -1
+    for start, end in sorted(nested):
+        if start >= last_end:
+            last_end = end
+            yield text[start:end]
+
+
+def _extract_json_object(text, validator=None):
+    """Pull a JSON object out of a model response without calling the model again
+
+    Tries each object embedded in the text and then the whole text, each
+    first strictly and then after _repair_json.
+
+    Args:
+        text (str): Raw model response
+        validator (callable): Optional check the object must pass
+
+    Returns:
+        dict: The parsed object, or None if nothing usable was found
+    """
+    for candidate in _iter_json_objects(text):
+        obj = _loads_lenient(candidate)
+        if isinstance(obj, dict) and (validator is None or validator(obj)):
+            return obj
+    obj = _loads_lenient(text)
+    if isinstance(obj, dict) and (validator is None or validator(obj)):
+        return obj
+    return None
+
+
+def _extract_json_array(text, validator=None):
+    """Pull a non-empty JSON array out of a model response
+
+    Tries an array of strings, then any bracketed span, then the whole
+    text, each first strictly and then after _repair_json.
+
+    Args:
+        text (str): Raw model response
+        validator (callable): Optional check the array must pass
+
+    Returns:
+        list: The parsed array, or None if nothing usable was found
+    """
+    matches = (_JSON_STR_ARR_RE.search(text), _JSON_ARR_RE.search(text))
+    candidates = [match.group(0) for match in matches if match]
+    candidates.append(text)
+    for candidate in candidates:
+        arr = _loads_lenient(candidate)
+        if isinstance(arr, list) and arr and (validator is None or validator(arr)):
+            return arr
+    return None
+
+
+_REQUIRED_HOOK_KEYS = ("opening_hook", "finale_hook", "subscription_hook")
+
+
+def _has_hook_keys(hooks):
+    """Check a parsed hooks object has the hooks the video needs"""
+    return all(key in hooks for key in _REQUIRED_HOOK_KEYS)
+
+
+def _has_hooks_and_terms(combined):
+    """Check a combined hooks/search-terms object is complete"""
+    hooks = combined.get("hooks")
+    search_terms = combined.get("search_terms")
+    return (isinstance(hooks, dict) and _has_hook_keys(hooks)
+            and isinstance(search_terms, list) and bool(search_terms))
+
+
+class _JsonObjectScanner:
+    """Track brace depth over streamed text to spot the end of a JSON object
+
+    Braces inside JSON strings are ignored, so the scanner reports the
+    object as complete exactly when its closing brace arrives.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+
+    def feed(self, text):
+        """Consume the next piece of text
+
+        Args:
+            text (str): The next chunk of the response
+
+        Returns:
+            bool: True once the first top-level object has been closed
+        """
+        for ch in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.started:
+                    self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+@lru_cache(maxsize=128)
+def _build_fallback_outline(title, genre):
+    """Build the placeholder outline used when outline generation fails
+
+    Args:
+        title (str): The main topic title
+        genre (str): The general genre/category
+
+    Returns:
+        dict: Basic outline structure; callers must copy it before handing
+            it out, since the cached object is shared
+    """
+    items = [
+        {
+            "rank": i,
+            "title": f"#{i}: Example of {title}",
+            "description": f"This is the #{i} best example of {title}.",
+            "visuals": [f"{title} {i}", f"{title} example {i}"]
+        }
+        for i in range(10, 0, -1)
+    ]
+
+    outline = {
+        "hook": f"Welcome to our top 10 video about {title}!",
+        "thesis": f"Today we're counting down the 10 best examples of {title} in the {genre} category.",
+        "items": items,
+        "conclusion": f"Thanks for watching our video about {title}. If you enjoyed this content, please like and subscribe!"
+    }
+
+    return outline
+
+
+@lru_cache(maxsize=128)
+def _build_fallback_script(title, genre):
+    """Build the placeholder script used when script generation fails
+
+    Args:
+        title (str): The main topic title
+        genre (str): The general genre/category
+
+    Returns:
+        str: Basic script structure
+    """
+    parts = [f"""
+        INTRO:
+        Welcome to our video about {title}! Today we'll be counting down the top 10 examples
+        in the {genre} category. Whether you're a fan or just curious, we've got some amazing
+        selections for you. Let's get started!
+        
+        """]
+
+    # Generate 10 sections
+    parts.extend(f"""
+            #{i}:
+            Coming in at number {i}, we have an amazing example of {title}. 
+            This one stands out because of its unique features and impressive qualities.
+            It's definitely earned its place on our list because of its outstanding 
+            characteristics and popularity among fans.
+            
+            """ for i in range(10, 0, -1))
+
+    parts.append(f"""
+        CONCLUSION:
+        Thanks for watching our countdown of the top 10 {title}! If you enjoyed this video,
+        please like, comment, and subscribe for more content like this. Let us know in the comments
+        if you agree with our list or if we missed any of your favorites!
+        """)
+
+    return "".join(parts)
+
+
+@lru_cache(maxsize=128)
+def _build_fallback_hooks(title, genre):
+    """Build the placeholder hooks used when hook generation fails
+
+    Args:
+        title (str): The main topic title
+        genre (str): The general genre/category
+
+    Returns:
+        str: JSON string with one text per hook type
+    """
+    return _json_dumps({
+        "opening_hook": f"These are the 10 most amazing examples of {title} you need to see!",
+        "intro_hook": f"The #1 item on this list shocked even the experts in {genre}!",
+        "midpoint_hook": f"You won't believe what's coming in the top 5 {title} examples!",
+        "finale_hook": f"The next example is considered by many to be the absolute best {title} of all time!",
+        "subscription_hook": f"Subscribe now for more amazing content about {genre} and {title}!"
+    })
+
+
+@lru_cache(maxsize=128)
+def _build_fallback_search_terms(title, count):
+    """Build the placeholder search terms used when generation fails
+
+    Args:
+        title (str): The main topic title
+        count (int): Number of terms to produce
+
+    Returns:
+        str: JSON array of search terms
+    """
+    return _json_dumps([f"{title} {i}" for i in range(1, count + 1)])
+
+
+@lru_cache(maxsize=128)
+def _build_fallback_short_outline(title):
+    """Build the placeholder outline used when short outline generation fails
+
+    Args:
+        title (str): The main topic title
+
+    Returns:
+        dict: Hook, points and call to action; callers must copy it before
+            handing it out, since the cached object is shared
+    """
+    return {
+        "hook": f"Did you know these facts about {title}?",
+        "points": [
+            {
+                "title": f"Amazing fact about {title}",
+                "content": f"Here's something incredible about {title} that most people don't know."
+            },
+            {
+                "title": "Surprising detail",
+                "content": f"This detail about {title} will surprise you!"
+            },
+            {
+                "title": "Final revelation",
+                "content": "The most important thing to remember is this key point."
+            }
+        ],
+        "call_to_action": "Follow for more interesting facts!"
+    }
+
+
 class PromptChain:
     """Advanced prompt chain for sophisticated content generation
     
@@ -23,6 +692,25 @@ class PromptChain:
     complex and refined content through a series of specialized AI interactions.
     """
     
+    # Common categories that might be inferred from title words
+    _GENRE_MAP = {
+        "game": "video games",
+        "food": "cooking",
+        "recipe": "cooking",
+        "film": "movies",
+        "movie": "movies",
+        "travel": "travel",
+        "place": "travel",
+        "technology": "tech",
+        "tech": "tech",
+        "history": "history",
+        "science": "science",
+        "book": "literature",
+        "music": "music",
+        "song": "music"
+    }
+    _GENRE_KEYS = frozenset(_GENRE_MAP)
+
     def __init__(self, title, genre="", language="english"):
         """Initialize the prompt chain
         
@@ -37,78 +725,68 @@ class PromptChain:
         self.language_code = get_language_code(language)
         self.results = {}
         self.max_retries = 2
+        # Upper bound in seconds on a single generation step
+        self.step_timeout = 150
+        # Prompts already sent during this run; a repeat means the caller is
+        # retrying after a bad response, so the cache must be bypassed
+        self._sent_prompts = set()
         
         # Using Google Gemini AI for content generation
-        config = read_config_file()
-        print("Using Google Gemini AI for content generation")
+        logger.info("Using Google Gemini AI for content generation")
         
     def _infer_genre(self, title):
         """Infer a general genre if none is provided"""
-        # Common categories that might be inferred from title words
-        genres = {
-            "game": "video games",
-            "food": "cooking",
-            "recipe": "cooking",
-            "film": "movies",
-            "movie": "movies",
-            "travel": "travel",
-            "place": "travel",
-            "technology": "tech",
-            "tech": "tech",
-            "history": "history",
-            "science": "science",
-            "book": "literature",
-            "music": "music",
-            "song": "music"
-        }
-        
-        # Check for genre keywords in the title
         words = title.lower().split()
-        for word in words:
-            if word in genres:
-                return genres[word]
-                
-        return "general"
+        hits = self._GENRE_KEYS.intersection(words)
+        if not hits:
+            return "general"
+        # Keep the first keyword in title order when several match
+        if len(hits) > 1:
+            return self._GENRE_MAP[min(hits, key=words.index)]
+        return self._GENRE_MAP[next(iter(hits))]
         
     async def execute_chain(self):
         """Execute the complete prompt chain
         
-        This is the main entry point that runs all steps in sequence.
+        This is the main entry point. Steps run in dependency order, with the
+        combined hooks/search-terms request overlapped with the script step.
         
         Returns:
             dict: The complete content generation results
         """
+        extras_task = None
         try:
-            print("\n==== Starting advanced content generation prompt chain ====")
+            logger.info("\n==== Starting advanced content generation prompt chain ====")
             start_time = time.time()
-            
-            # Execute steps in sequence
-            print("Step 1/5: Researching topic...")
+
+            logger.info("Step 1/4: Researching topic...")
             self.results["research"] = await self._execute_research()
-            
-            print("Step 2/5: Creating content outline...")
+
+            logger.info("Step 2/4: Creating content outline...")
             self.results["outline"] = await self._create_outline()
-            
-            print("Step 3/5: Developing full script...")
+
+            # Hooks and search terms only need the outline, so they come from
+            # one combined request that runs while the script is written
+            logger.info("Step 3/4: Developing full script (hooks and search terms in parallel)...")
+            extras_task = asyncio.create_task(self._create_hooks_and_terms())
             self.results["detailed_script"] = await self._develop_full_script()
-            
-            print("Step 4/5: Creating engagement hooks...")
-            self.results["hooks"] = await self._create_hooks()
-            
-            print("Step 5/5: Generating optimal search terms...")
-            self.results["search_terms"] = await self._generate_search_terms()
-            
+
+            logger.info("Step 4/4: Collecting engagement hooks and search terms...")
+            self.results["hooks"], self.results["search_terms"] = await extras_task
+
             elapsed = time.time() - start_time
-            print(f"==== Completed content generation in {elapsed:.2f} seconds ====\n")
+            logger.info(f"==== Completed content generation in {elapsed:.2f} seconds ====\n")
             
             # Compile and return final output
             return self._compile_final_output()
             
         except Exception as e:
-            print(f"Error during prompt chain execution: {e}")
+            logger.warning(f"Error during prompt chain execution: {e}")
+            if extras_task is not None and not extras_task.done():
+                extras_task.cancel()
             # If we have partial results, try to salvage what we can
             if self.results and "outline" in self.results:
-                print("Attempting to compile partial results...")
+                logger.info("Attempting to compile partial results...")
                 return self._compile_final_output()
             else:
                 # If we don't have enough to work with, raise the error
@@ -121,27 +799,27 @@ class PromptChain:
             dict: Content generation results for short videos
         """
         try:
-            print("\n==== Starting short video content generation ====")
+            logger.info("\n==== Starting short video content generation ====")
             start_time = time.time()
             
             # Execute short video steps
-            print("Step 1/3: Creating short video outline...")
+            logger.info("Step 1/3: Creating short video outline...")
             self.results["outline"] = await self._create_short_outline()
             
-            print("Step 2/3: Developing short script...")
+            logger.info("Step 2/3: Developing short script...")
             self.results["detailed_script"] = await self._develop_short_script()
             
-            print("Step 3/3: Generating visual search terms...")
+            logger.info("Step 3/3: Generating visual search terms...")
             self.results["search_terms"] = await self._generate_search_terms(is_short=True)
             
             elapsed = time.time() - start_time
-            print(f"==== Completed short video content in {elapsed:.2f} seconds ====\n")
+            logger.info(f"==== Completed short video content in {elapsed:.2f} seconds ====\n")
             
             # Compile and return final output
             return self._compile_short_output()
             
         except Exception as e:
-            print(f"Error during short prompt chain execution: {e}")
+            logger.warning(f"Error during short prompt chain execution: {e}")
             raise
     
     async def _execute_research(self):
@@ -150,34 +828,15 @@ class PromptChain:
         Returns:
             str: Research results about the topic
         """
-        prompt = f"""
-        You're a professional researcher gathering key information about {self.title}.
-        
-        Provide comprehensive background information including:
-        1. What exactly is {self.title}? Provide a clear definition.
-        2. Historical context and development
-        3. Key facts, statistics, or notable features
-        4. Why this topic is interesting or important
-        5. Current trends or developments related to {self.title}
-        
-        For a top 10 video about {self.title}, what are the most important pieces of information
-        that would make the content factually accurate and interesting to viewers?
+        prompt = _PROMPTS["research"].format_map(_SafeDict(title=self.title))
         
-        Focus on providing factual, detailed information rather than just opinions.
-        
-        Format your response as paragraphs of factual information, not as a script.
-        """
-        
-        for attempt in range(self.max_retries):
-            try:
-                research = await self._generate_content(prompt)
-                # Basic validation - check length and if it contains actual content
-                if len(research) > 300 and ":" in research:
-                    return research
-            except Exception as e:
-                print(f"Research generation attempt {attempt+1} failed: {e}")
-                if attempt == self.max_retries - 1:
-                    raise
+        def accept(research):
+            # Basic validation - check length and if it contains actual content
+            return research if len(research) > 300 and ":" in research else None
+
+        research, _ = await self._generate_with_retry(prompt, accept, "Research")
+        if research is not None:
+            return research
         
         # Fallback minimal research
         return f"The topic {self.title} is part of the {self.genre} category. This will be a top 10 video about the best examples of {self.title}."
@@ -186,90 +845,25 @@ class PromptChain:
         """Create a compelling video outline
         
         Returns:
-            str: Structured outline for the video content
+            dict: Structured outline for the video content
         """
         # Include research results if available
         research_context = ""
         if "research" in self.results:
-            research_context = f"""
-            Based on this research information:
-            {self.results["research"]}
-            """
+            research_context = _PROMPTS["research_context"].format_map(_SafeDict(research=self.results["research"]))
             
-        prompt = f"""
-        You're a top-tier YouTube content strategist creating an engaging outline for a video about {self.title}.
-        {research_context}
+        prompt = _PROMPTS["outline"].format_map(_SafeDict(title=self.title, research_context=research_context))
         
-        Create a compelling video outline with:
-        1. An attention-grabbing hook for the first 15 seconds
-        2. A clear thesis statement explaining what viewers will learn
-        3. 10 main points/items about {self.title}, organized in logical progression
-        4. For each of the 10 points, include:
-           - A concise headline
-           - Key supporting details/facts
-           - Potential visual elements that would enhance this section
-        5. A conclusion with a thought-provoking question and clear call-to-action
-        
-        Format as structured JSON with the following format:
-        {{
-          "hook": "Opening hook text here",
-          "thesis": "Main thesis statement",
-          "items": [
-            {{
-              "rank": 10,
-              "title": "Item title",
-              "description": "Description with key points",
-              "visuals": ["visual element 1", "visual element 2"]
-            }},
-            // ... 9 more items in descending order (10, 9, 8...)
-          ],
-          "conclusion": "Conclusion text with call to action"
-        }}
-        
-        The 10 items should be in descending order, starting with #10 and ending with #1 (the best).
-        """
-        
-        for attempt in range(self.max_retries):
-            try:
-                outline_result = await self._generate_content(prompt)
-                # Try to parse as JSON to validate
-                try:
-                    # Try to find and extract valid JSON if it's embedded in other text
-                    import re
-                    json_match = re.search(r'(\{[\s\S]*\})', outline_result)
-                    if json_match:
-                        json_str = json_match.group(1)
-                        try:
-                            outline_json = json.loads(json_str)
-                            if self._validate_outline(outline_json):
-                                return json.dumps(outline_json)
-                        except:
-                            pass
-                    
-                    # If that didn't work, try the original string
-                    outline_json = json.loads(outline_result)
-                    if self._validate_outline(outline_json):
-                        return outline_result
-                except json.JSONDecodeError:
-                    print(f"Could not parse outline as JSON, attempt {attempt+1}")
-                    # Try to fix common JSON formatting issues
-                    try:
-                        # Replace single quotes with double quotes
-                        fixed_json = outline_result.replace("'", '"')
-                        # Fix unquoted keys
-                        fixed_json = re.sub(r'(\s*?)(\w+)(\s*?):', r'\1"\2"\3:', fixed_json)
-                        # Try to parse the fixed JSON
-                        outline_json = json.loads(fixed_json)
-                        if self._validate_outline(outline_json):
-                            return json.dumps(outline_json)
-                    except:
-                        if attempt == self.max_retries - 1:
-                            # Last attempt, try to extract usable content
-                            return self._extract_outline_fallback(outline_result)
-            except Exception as e:
-                print(f"Outline generation attempt {attempt+1} failed: {e}")
-                if attempt == self.max_retries - 1:
-                    raise
+        def accept(outline_result):
+            return _extract_json_object(outline_result, self._validate_outline)
+
+        outline, outline_result = await self._generate_with_retry(
+            prompt, accept, "Outline", self._generate_json_content)
+        if outline is not None:
+            return outline
+        if outline_result is not None and _extract_json_object(outline_result) is None:
+            # The last response was not JSON at all; salvage what text it has
+            return await asyncio.to_thread(self._extract_outline_fallback, outline_result)
         
         # Create minimal fallback outline
         return self._create_fallback_outline()
@@ -305,7 +899,7 @@ class PromptChain:
             outline_text (str): The raw outline text
             
         Returns:
-            str: A simplified JSON outline
+            dict: A simplified outline
         """
         # Basic extraction of components
         lines = outline_text.split('\n')
@@ -316,8 +910,10 @@ class PromptChain:
         
         # Try to extract numbered items
         current_item = None
+        description_parts = []
         for line in lines:
             line = line.strip()
+            number = _NUMBER_PREFIX_RE.match(line)
             
             # Look for hooks
             if "hook" in line.lower() and ":" in line:
@@ -332,70 +928,65 @@ class PromptChain:
                 conclusion = line.split(":", 1)[1].strip()
                 
             # Look for numbered items (10. Item title, #9 - Item title, etc.)
-            elif any(f"{i}" in line[:5] for i in range(1, 11)):
-                for i in range(1, 11):
-                    if f"{i}." in line[:5] or f"#{i}" in line[:5] or f"{i}:" in line[:5]:
-                        if current_item:
-                            items.append(current_item)
-                        title = line.split(".", 1)[1].strip() if "." in line else line
-                        current_item = {
-                            "rank": i,
-                            "title": title,
-                            "description": f"This is item #{i} about {self.title}",
-                            "visuals": [f"{self.title} {i}", f"{title} visualization"]
-                        }
-                        break
+            elif number:
+                if current_item:
+                    items.append(self._finish_fallback_item(current_item, description_parts))
+                i = int(number.group(1) or number.group(2))
+                title = line.split(".", 1)[1].strip() if "." in line else line
+                current_item = {
+                    "rank": i,
+                    "title": title,
+                    "visuals": [f"{self.title} {i}", f"{title} visualization"]
+                }
+                description_parts = [f"This is item #{i} about {self.title}"]
             
             # Add text to current item description
             elif current_item and line and not line.startswith("#") and not line.startswith("{") and not line.startswith("}"):
-                current_item["description"] = current_item.get("description", "") + " " + line
+                description_parts.append(line)
         
         # Add the last item if it exists
         if current_item:
-            items.append(current_item)
+            items.append(self._finish_fallback_item(current_item, description_parts))
             
         # If we couldn't extract enough items, create some
-        while len(items) < 10:
-            items.append({
-                "rank": len(items) + 1,
-                "title": f"Example of {self.title} #{len(items) + 1}",
+        items.extend(
+            {
+                "rank": i,
+                "title": f"Example of {self.title} #{i}",
                 "description": f"This is an interesting example of {self.title}.",
                 "visuals": [f"{self.title} example", f"{self.title} visual"]
-            })
+            }
+            for i in range(len(items) + 1, 11)
+        )
         
-        # Create JSON structure
-        outline = {
+        return {
             "hook": hook,
             "thesis": thesis,
             "items": items,
             "conclusion": conclusion
         }
-        
-        return json.dumps(outline, indent=2)
     
+    @staticmethod
+    def _finish_fallback_item(item, description_parts):
+        """Join the collected description lines into an outline item
+
+        Args:
+            item (dict): The item being built
+            description_parts (list): Description fragments in order
+
+        Returns:
+            dict: The item with its description filled in
+        """
+        item["description"] = " ".join(description_parts)
+        return item
+
     def _create_fallback_outline(self):
         """Create a minimal fallback outline when all else fails
         
         Returns:
-            str: JSON string with basic outline structure
+            dict: Basic outline structure
         """
-        items = []
-        for i in range(10, 0, -1):
-            items.append({
-                "rank": i,
-                "title": f"#{i}: Example of {self.title}",
-                "description": f"This is the #{i} best example of {self.title}.",
-                "visuals": [f"{self.title} {i}", f"{self.title} example {i}"]
-            })
-            
-        outline = {
-            "hook": f"Welcome to our top 10 video about {self.title}!",
-            "thesis": f"Today we're counting down the 10 best examples of {self.title} in the {self.genre} category.",
-            "items": items,
-            "conclusion": f"Thanks for watching our video about {self.title}. If you enjoyed this content, please like and subscribe!"
-        }
-        
-        return json.dumps(outline, indent=2)
+        return copy.deepcopy(_build_fallback_outline(self.title, self.genre))
         
     async def _develop_full_script(self):
         """Develop the full detailed script based on the outline
@@ -404,61 +995,39 @@ class PromptChain:
             str: Complete script with all sections
         """
         try:
-            # Parse the outline
             if not self.results.get("outline"):
                 raise ValueError("Outline not available")
                 
-            outline_json = json.loads(self.results["outline"])
+            outline_json = self.results["outline"]
             
             # Build the prompt with the outline structure
-            prompt = f"""
-            You are an expert YouTube scriptwriter creating a professional script for a top 10 video about {self.title}.
-            
-            Use this outline to create a complete, detailed script:
-            
-            HOOK: {outline_json.get("hook", f"Welcome to our video about {self.title}")}
-            
-            THESIS: {outline_json.get("thesis", f"Today we'll explore the top 10 examples of {self.title}")}
-            
-            ITEMS:
-            """
-            
             # Add each item from the outline
-            items = outline_json.get("items", [])
-            for item in items:
-                prompt += f"""
-                #{item.get("rank", "")}: {item.get("title", "")}
-                Details: {item.get("description", "")}
-                
-                """
-                
-            prompt += f"""
-            CONCLUSION: {outline_json.get("conclusion", "Thanks for watching!")}
-            
-            For each section, write natural, engaging content that:
-            1. Uses conversational language and a friendly tone
-            2. Includes interesting facts and details to educate viewers
-            3. Uses transitions between sections
-            4. Includes occasional questions or statements that directly engage the audience
-            5. For the top items (#3, #2, #1), builds excitement and anticipation
-            
-            Format the script with clear section headers (INTRO, #10, #9... etc., CONCLUSION) 
-            and make the content flow naturally between sections.
-            
-            The entire script should be comprehensive, with at least 150-200 words for each of the top 10 items.
-            """
+            items = "".join(
+                _PROMPTS["script_item"].format_map(_SafeDict(
+                    rank=item.get("rank", ""),
+                    item_title=item.get("title", ""),
+                    description=item.get("description", "")))
+                for item in outline_json.get("items", [])
+            )
+            prompt = _PROMPTS["script"].format_map(_SafeDict(
+                title=self.title,
+                hook=outline_json.get("hook", f"Welcome to our video about {self.title}"),
+                thesis=outline_json.get("thesis", f"Today we'll explore the top 10 examples of {self.title}"),
+                items=items,
+                conclusion=outline_json.get("conclusion", "Thanks for watching!")))
             
             script = await self._generate_content(prompt)
             
-            # Verify we got substantial content
-            if len(script) < 500:
-                print("Warning: Generated script is too short, attempting to expand...")
+            # Only re-prompt when the response was cut off; a short but
+            # complete script is not worth another round trip
+            if _script_looks_truncated(script, len(outline_json.get("items", []))):
+                logger.warning("Generated script looks truncated, attempting to expand...")
                 return await self._expand_script(script)
                 
             return script
             
         except Exception as e:
-            print(f"Error developing full script: {e}")
+            logger.warning(f"Error developing full script: {e}")
             # Create a minimal script as fallback
             return self._create_fallback_script()
     
@@ -471,21 +1040,7 @@ class PromptChain:
         Returns:
             str: The expanded script
         """
-        prompt = f"""
-        The following script for a video about {self.title} needs to be expanded with more detail,
-        examples, and engaging content:
-        
-        {initial_script}
-        
-        Please expand this script to make it more comprehensive and engaging:
-        1. Add more specific details, examples, and facts for each section
-        2. Include more descriptive language and vivid imagery
-        3. Add rhetorical questions and calls for audience engagement
-        4. Make sure each of the top 10 items has at least 150-200 words of content
-        5. Ensure smooth transitions between sections
-        
-        Provide the complete expanded script while maintaining the original structure and key points.
-        """
+        prompt = _PROMPTS["expand"].format_map(_SafeDict(title=self.title, initial_script=initial_script))
         
         expanded_script = await self._generate_content(prompt)
         return expanded_script
@@ -496,33 +1051,37 @@ class PromptChain:
         Returns:
             str: Basic script structure
         """
-        script = f"""
-        INTRO:
-        Welcome to our video about {self.title}! Today we'll be counting down the top 10 examples
-        in the {self.genre} category. Whether you're a fan or just curious, we've got some amazing
-        selections for you. Let's get started!
-        
-        """
-        
-        # Generate 10 sections
-        for i in range(10, 0, -1):
-            script += f"""
-            #{i}:
-            Coming in at number {i}, we have an amazing example of {self.title}. 
-            This one stands out because of its unique features and impressive qualities.
-            It's definitely earned its place on our list because of its outstanding 
-            characteristics and popularity among fans.
-            
-            """
-        
-        script += f"""
-        CONCLUSION:
-        Thanks for watching our countdown of the top 10 {self.title}! If you enjoyed this video,
-        please like, comment, and subscribe for more content like this. Let us know in the comments
-        if you agree with our list or if we missed any of your favorites!
+        return _build_fallback_script(self.title, self.genre)
+    
+    async def _create_hooks_and_terms(self):
+        """Create the hooks and the visual search terms in a single request
+
+        Both only depend on the outline, so one JSON response carries them.
+        If the response cannot be used, falls back to the separate hook and
+        search-term prompts, both built from the outline only.
+
+        Returns:
+            tuple: (hooks JSON string, search terms JSON string)
         """
-        
-        return script
+        outline = self.results.get("outline") or {}
+        titles = [item.get("title", "") for item in outline.get("items", []) if isinstance(item, dict)]
+
+        prompt = _PROMPTS["hooks_and_terms"].format_map(_SafeDict(
+            title=self.title, genre=self.genre, titles=_json_dumps(titles)))
+
+        try:
+            result = await self._generate_content(prompt)
+            combined = await asyncio.to_thread(_extract_json_object, result, _has_hooks_and_terms)
+            if combined is not None:
+                return _json_dumps(combined["hooks"]), _json_dumps(combined["search_terms"])
+            logger.warning("Combined hooks/search terms response was incomplete, requesting separately")
+        except Exception as e:
+            logger.warning(f"Error creating hooks and search terms: {e}")
+
+        # The script step may still be running, so the fallback search terms
+        # are always built from the outline alone; quoting the script only
+        # when it happened to finish first would make the prompt timing-dependent
+        return await asyncio.gather(self._create_hooks(), self._generate_search_terms(include_script=False))
     
     async def _create_hooks(self):
         """Create compelling hooks for different parts of the video
@@ -530,83 +1089,24 @@ class PromptChain:
         Returns:
             dict: Different hooks for various parts of the video
         """
-        prompt = f"""
-        Create compelling, attention-grabbing hooks for a YouTube video about {self.title}.
-        
-        For each hook type, create a script segment that will immediately capture viewer attention:
-        
-        1. OPENING HOOK (first 5 seconds): A powerful statement or question that stops scrolling viewers
-        2. INTRO HOOK (15-20 seconds in): An intriguing fact or statement that makes viewers want to see the full countdown
-        3. MIDPOINT HOOK (for item #5): A statement that builds anticipation for the top items
-        4. FINALE HOOK (before item #1): A statement that creates maximum anticipation for the #1 spot
-        5. SUBSCRIPTION HOOK (outro): A compelling reason for viewers to subscribe
-        
-        For each hook, use psychological techniques like curiosity gaps, powerful statistics,
-        provocative questions, or bold claims that create emotional engagement.
-        
-        Format your response as JSON with the following structure:
-        {{
-          "opening_hook": "Hook text here",
-          "intro_hook": "Hook text here",
-          "midpoint_hook": "Hook text here",
-          "finale_hook": "Hook text here",
-          "subscription_hook": "Hook text here"
-        }}
-        """
+        prompt = _PROMPTS["hooks"].format_map(_SafeDict(title=self.title))
         
         try:
             hooks_result = await self._generate_content(prompt)
-            # Try to parse as JSON to validate
-            try:
-                # Try to find and extract valid JSON if it's embedded in other text
-                import re
-                json_match = re.search(r'(\{[\s\S]*\})', hooks_result)
-                if json_match:
-                    json_str = json_match.group(1)
-                    try:
-                        hooks_json = json.loads(json_str)
-                        if all(key in hooks_json for key in ["opening_hook", "finale_hook", "subscription_hook"]):
-                            return json.dumps(hooks_json)
-                    except:
-                        pass
-                
-                # If that didn't work, try the original string
-                hooks_json = json.loads(hooks_result)
-                # Basic validation
-                if all(key in hooks_json for key in ["opening_hook", "finale_hook", "subscription_hook"]):
-                    return hooks_result
-            except json.JSONDecodeError:
-                print("Could not parse hooks as JSON, attempting to fix...")
-                try:
-                    # Replace single quotes with double quotes
-                    fixed_json = hooks_result.replace("'", '"')
-                    # Fix unquoted keys
-                    fixed_json = re.sub(r'(\s*?)(\w+)(\s*?):', r'\1"\2"\3:', fixed_json)
-                    # Try to parse the fixed JSON
-                    hooks_json = json.loads(fixed_json)
-                    if all(key in hooks_json for key in ["opening_hook", "finale_hook", "subscription_hook"]):
-                        return json.dumps(hooks_json)
-                except:
-                    print("Could not parse hooks as JSON, creating fallback")
+            hooks = await asyncio.to_thread(self._parse_hooks, hooks_result)
+            if hooks is not None:
+                return hooks
         except Exception as e:
-            print(f"Error creating hooks: {e}")
+            logger.warning(f"Error creating hooks: {e}")
             
-        # Create fallback hooks
-        hooks = {
-            "opening_hook": f"These are the 10 most amazing examples of {self.title} you need to see!",
-            "intro_hook": f"The #1 item on this list shocked even the experts in {self.genre}!",
-            "midpoint_hook": f"You won't believe what's coming in the top 5 {self.title} examples!",
-            "finale_hook": f"The next example is considered by many to be the absolute best {self.title} of all time!",
-            "subscription_hook": f"Subscribe now for more amazing content about {self.genre} and {self.title}!"
-        }
-        
-        return json.dumps(hooks, indent=2)
+        return _build_fallback_hooks(self.title, self.genre)
     
-    async def _generate_search_terms(self, is_short=False):
+    async def _generate_search_terms(self, is_short=False, include_script=True):
         """Generate optimal search terms for media based on the content
         
         Args:
             is_short (bool): Whether this is for a short video
+            include_script (bool): Whether to quote the start of the script
             
         Returns:
             list: List of search terms for visuals
@@ -614,180 +1114,93 @@ class PromptChain:
         # Construct content from available results
         content = f"Topic: {self.title}\nGenre: {self.genre}\n\n"
         
-        if "outline" in self.results:
-            try:
-                outline = json.loads(self.results["outline"])
-                content += f"Outline: {json.dumps(outline, indent=2)}\n\n"
-            except:
-                content += f"Outline: {self.results['outline']}\n\n"
+        # Only the section titles and the start of the script go into the
+        # prompt; the full outline and script add tokens without improving
+        # the search terms
+        if self.results.get("outline"):
+            outline = self.results["outline"]
+            sections = outline.get("items") or outline.get("points") or []
+            titles = [section.get("title", "") for section in sections if isinstance(section, dict)]
+            content += f"Outline: {_json_dumps({'items': titles})}\n\n"
                 
-        if "detailed_script" in self.results and len(self.results["detailed_script"]) < 15000:
-            content += f"Script: {self.results['detailed_script']}\n\n"
+        if include_script and "detailed_script" in self.results:
+            content += f"Script excerpt: {self.results['detailed_script'][:_SCRIPT_EXCERPT_CHARS]}\n\n"
             
-        prompt = f"""
-        Based on this video content about {self.title}:
-        
-        {content}
-        
-        Generate {"10" if is_short else "20"} highly specific, visually descriptive search terms for finding
-        stock footage or images that would perfectly accompany this content.
-        
-        For each search term:
-        1. Be extremely specific and visually detailed
-        2. Include suggestions for camera angles, lighting, or composition
-        3. Focus on dynamic, high-quality visuals that would engage viewers
-        4. Avoid generic terms - be precise about what should be shown
-        
-        Format your response ONLY as a JSON array of strings with the search terms.
-        Example: ["aerial view of modern Tokyo skyline at sunset", "close-up of gaming controller with neon lighting"]
-        """
+        prompt = _PROMPTS["search_terms"].format_map(_SafeDict(
+            title=self.title, content=content, count=10 if is_short else 20))
         
         try:
             search_terms_result = await self._generate_content(prompt)
-            
-            # Try to extract JSON array
-            try:
-                # First look for anything that seems like a JSON array
-                import re
-                array_match = re.search(r'\[\s*".*"\s*\]', search_terms_result, re.DOTALL)
-                if array_match:
-                    search_terms_json = json.loads(array_match.group(0))
-                else:
-                    # Try to extract array from text that might contain explanations
-                    array_match = re.search(r'(\[[\s\S]*?\])', search_terms_result)
-                    if array_match:
-                        try:
-                            search_terms_json = json.loads(array_match.group(1))
-                        except:
-                            # Try the full string
-                            search_terms_json = json.loads(search_terms_result)
-                    else:
-                        search_terms_json = json.loads(search_terms_result)
-                
-                if isinstance(search_terms_json, list) and len(search_terms_json) > 0:
-                    return json.dumps(search_terms_json)
-            except json.JSONDecodeError:
-                print("Could not parse search terms as JSON, attempting to fix...")
-                try:
-                    # Try to extract terms manually
-                    terms = []
-                    # Look for quoted strings
-                    quoted_strings = re.findall(r'"([^"]*)"', search_terms_result)
-                    if quoted_strings:
-                        terms = quoted_strings
-                    else:
-                        # Try to extract lines that might be search terms
-                        lines = search_terms_result.split('\n')
-                        for line in lines:
-                            # Look for lines that start with numbers, bullets, etc.
-                            if re.match(r'^[\d\.\-\*]\s+(.+)$', line.strip()):
-                                term = re.sub(r'^[\d\.\-\*]\s+', '', line.strip())
-                                if term and len(term) > 5:  # Avoid very short terms
-                                    terms.append(term)
-                    
-                    if terms:
-                        return json.dumps(terms)
-                    print("Could not parse search terms as JSON, creating fallback")
-                except:
-                    print("Could not parse search terms as JSON, creating fallback")
+            search_terms = await asyncio.to_thread(self._parse_search_terms, search_terms_result)
+            if search_terms is not None:
+                return search_terms
         except Exception as e:
-            print(f"Error generating search terms: {e}")
+            logger.warning(f"Error generating search terms: {e}")
             
-        # Create fallback search terms
-        count = 10 if is_short else 20
-        search_terms = [f"{self.title} {i}" for i in range(1, count + 1)]
-        return json.dumps(search_terms)
+        return _build_fallback_search_terms(self.title, 10 if is_short else 20)
     
-    async def _create_short_outline(self):
-        """Create an outline specifically for short-form videos
+    def _parse_hooks(self, hooks_result):
+        """Parse and validate a hooks response
         
+        Args:
+            hooks_result (str): Raw model response
+            
         Returns:
-            str: JSON outline for short videos
+            str: Hooks JSON string, or None if the response is unusable
         """
-        prompt = f"""
-        Create an engaging outline for a 30-60 second short vertical video about {self.title}.
-        
-        The outline should include:
-        1. An attention-grabbing hook (first 3 seconds)
-        2. 3-5 key points that can be covered in a very brief format
-        3. A strong call-to-action
+        hooks_json = _extract_json_object(hooks_result, _has_hook_keys)
+        if hooks_json is None:
+            logger.warning("Could not parse hooks as JSON, creating fallback")
+            return None
+        return _json_dumps(hooks_json)
+    
+    def _parse_search_terms(self, search_terms_result):
+        """Parse a search-terms response into a JSON array
         
-        Format as structured JSON with the following format:
-        {{
-          "hook": "Opening hook text here",
-          "points": [
-            {{
-              "title": "Point title",
-              "content": "Brief point content"
-            }},
-            // ... more points
-          ],
-          "call_to_action": "CTA text here"
-        }}
+        Args:
+            search_terms_result (str): Raw model response
+            
+        Returns:
+            str: Search terms JSON string, or None if the response is unusable
+        """
+        search_terms_json = _extract_json_array(search_terms_result)
+        if search_terms_json is not None:
+            return _json_dumps(search_terms_json)
+
+        logger.warning("Could not parse search terms as JSON, attempting to fix...")
+        # Fall back to quoted strings, then to bulleted or numbered lines
+        terms = _QUOTED_STR_RE.findall(search_terms_result)
+        if not terms:
+            for line in search_terms_result.split('\n'):
+                bullet = _NUM_BULLET_RE.match(line.strip())
+                if bullet and len(bullet.group(1)) > 5:  # Avoid very short terms
+                    terms.append(bullet.group(1))
+        if terms:
+            return _json_dumps(terms)
+        logger.warning("Could not parse search terms as JSON, creating fallback")
+        return None
+    
+    async def _create_short_outline(self):
+        """Create an outline specifically for short-form videos
         
-        Remember this is for a SHORT video (30-60 seconds), so content must be concise and impactful.
+        Returns:
+            dict: Outline for short videos
         """
+        prompt = _PROMPTS["short_outline"].format_map(_SafeDict(title=self.title))
         
-        for attempt in range(self.max_retries):
-            try:
-                outline_result = await self._generate_content(prompt)
-                # Try to parse as JSON to validate
-                try:
-                    # Try to find and extract valid JSON if it's embedded in other text
-                    import re
-                    json_match = re.search(r'(\{[\s\S]*\})', outline_result)
-                    if json_match:
-                        json_str = json_match.group(1)
-                        try:
-                            outline_json = json.loads(json_str)
-                            if "hook" in outline_json and "points" in outline_json:
-                                return json.dumps(outline_json)
-                        except:
-                            pass
-                    
-                    # If that didn't work, try the original string
-                    outline_json = json.loads(outline_result)
-                    # Basic validation
-                    if "hook" in outline_json and "points" in outline_json:
-                        return outline_result
-                except json.JSONDecodeError:
-                    print(f"Could not parse short outline as JSON, attempt {attempt+1}")
-                    # Try to fix common JSON formatting issues
-                    try:
-                        # Replace single quotes with double quotes
-                        fixed_json = outline_result.replace("'", '"')
-                        # Fix unquoted keys
-                        fixed_json = re.sub(r'(\s*?)(\w+)(\s*?):', r'\1"\2"\3:', fixed_json)
-                        # Try to parse the fixed JSON
-                        outline_json = json.loads(fixed_json)
-                        if "hook" in outline_json and "points" in outline_json:
-                            return json.dumps(outline_json)
-                    except:
-                        pass
-            except Exception as e:
-                print(f"Short outline generation attempt {attempt+1} failed: {e}")
+        def accept(outline_result):
+            return _extract_json_object(
+                outline_result, lambda outline: "hook" in outline and "points" in outline)
+
+        try:
+            outline, _ = await self._generate_with_retry(
+                prompt, accept, "Short outline", self._generate_json_content)
+            if outline is not None:
+                return outline
+        except Exception:
+            pass
                 
-        # Create fallback short outline
-        outline = {
-            "hook": f"Did you know these facts about {self.title}?",
-            "points": [
-                {
-                    "title": f"Amazing fact about {self.title}",
-                    "content": f"Here's something incredible about {self.title} that most people don't know."
-                },
-                {
-                    "title": "Surprising detail",
-                    "content": f"This detail about {self.title} will surprise you!"
-                },
-                {
-                    "title": "Final revelation",
-                    "content": "The most important thing to remember is this key point."
-                }
-            ],
-            "call_to_action": "Follow for more interesting facts!"
-        }
-        
-        return json.dumps(outline, indent=2)
+        return copy.deepcopy(_build_fallback_short_outline(self.title))
         
     async def _develop_short_script(self):
         """Develop a script for short-form videos
@@ -796,54 +1209,36 @@ class PromptChain:
             str: Complete short video script
         """
         try:
-            # Parse the short outline
             if not self.results.get("outline"):
                 raise ValueError("Short outline not available")
                 
-            outline_json = json.loads(self.results["outline"])
+            outline_json = self.results["outline"]
             
             # Build the prompt with the outline structure
-            prompt = f"""
-            You are an expert creating viral short-form video scripts (30-60 seconds) about {self.title}.
-            
-            Use this outline to create a complete, engaging script for a vertical video:
-            
-            HOOK: {outline_json.get("hook", f"Did you know these facts about {self.title}?")}
-            
-            POINTS:
-            """
-            
             # Add each point from the outline
-            points = outline_json.get("points", [])
-            for point in points:
-                prompt += f"""
-                - {point.get("title", "")}: {point.get("content", "")}
-                """
-                
-            prompt += f"""
-            CALL TO ACTION: {outline_json.get("call_to_action", "Follow for more content like this!")}
-            
-            Write a natural, engaging script that:
-            1. Uses short, punchy sentences ideal for short-form video
-            2. Includes visual direction notes for each section [in brackets]
-            3. Times out to approximately 30-60 seconds when read at normal pace
-            4. Uses hooks, patterns interrupts, and questions to maintain viewer attention
-            5. Has a clear structure: Hook → Points → Call to action
-            
-            Format the final script with clear section breaks and include approximate timing for each section.
-            """
+            points = "".join(
+                _PROMPTS["short_script_point"].format_map(_SafeDict(
+                    point_title=point.get("title", ""),
+                    point_content=point.get("content", "")))
+                for point in outline_json.get("points", [])
+            )
+            prompt = _PROMPTS["short_script"].format_map(_SafeDict(
+                title=self.title,
+                hook=outline_json.get("hook", f"Did you know these facts about {self.title}?"),
+                points=points,
+                call_to_action=outline_json.get("call_to_action", "Follow for more content like this!")))
             
             short_script = await self._generate_content(prompt)
             
             # Verify we got substantial content
             if len(short_script) < 200:
-                print("Warning: Generated short script is too short, using fallback...")
+                logger.warning("Generated short script is too short, using fallback...")
                 return self._create_fallback_short_script()
                 
             return short_script
             
         except Exception as e:
-            print(f"Error developing short script: {e}")
+            logger.warning(f"Error developing short script: {e}")
             return self._create_fallback_short_script()
             
     def _create_fallback_short_script(self):
@@ -890,10 +1285,10 @@ class PromptChain:
             "top10": []
         }
         
-        # Parse outline if available
+        # Use outline if available
         try:
             if "outline" in self.results:
-                outline = json.loads(self.results["outline"])
+                outline = self.results["outline"]
                 
                 # Extract hook, thesis and conclusion
                 output["intro_text"] = outline.get("hook", "") + " " + outline.get("thesis", "")
@@ -913,7 +1308,7 @@ class PromptChain:
             if output["top10"]:
                 output["top10"] = sorted(output["top10"], key=lambda x: x.get("rank", 0), reverse=True)
         except Exception as e:
-            print(f"Error parsing outline: {e}")
+            logger.warning(f"Error parsing outline: {e}")
             # Create fallback items if needed
             if not output.get("top10"):
                 output["top10"] = [
@@ -926,15 +1321,15 @@ class PromptChain:
         # Add hooks if available
         try:
             if "hooks" in self.results:
-                hooks = json.loads(self.results["hooks"])
+                hooks = _json_loads(self.results["hooks"])
                 output["hooks"] = hooks
         except Exception as e:
-            print(f"Error parsing hooks: {e}")
+            logger.warning(f"Error parsing hooks: {e}")
             
         # Add search terms if available
         try:
             if "search_terms" in self.results:
-                search_terms = json.loads(self.results["search_terms"])
+                search_terms = _json_loads(self.results["search_terms"])
                 output["search_terms"] = search_terms
                 
                 # Distribute search terms to items without them
@@ -951,7 +1346,7 @@ class PromptChain:
                                     term_index += 1
                             item["search_terms"] = item_terms
         except Exception as e:
-            print(f"Error parsing search terms: {e}")
+            logger.warning(f"Error parsing search terms: {e}")
             
         # Add detailed script if available
         if "detailed_script" in self.results:
@@ -975,10 +1370,10 @@ class PromptChain:
             "scenes": []
         }
         
-        # Parse outline if available
+        # Use outline if available
         try:
             if "outline" in self.results:
-                outline = json.loads(self.results["outline"])
+                outline = self.results["outline"]
                 
                 # Add hook as first scene
                 if "hook" in outline:
@@ -1006,7 +1401,7 @@ class PromptChain:
                         "search_terms": ["subscribe reminder", "follow call to action"]
                     })
         except Exception as e:
-            print(f"Error compiling short output: {e}")
+            logger.warning(f"Error compiling short output: {e}")
             
             # Create fallback scenes
             output["scenes"] = [
@@ -1030,7 +1425,7 @@ class PromptChain:
         # Add search terms if available
         try:
             if "search_terms" in self.results:
-                search_terms = json.loads(self.results["search_terms"])
+                search_terms = _json_loads(self.results["search_terms"])
                 
                 # Distribute search terms to scenes
                 if isinstance(search_terms, list) and output["scenes"]:
@@ -1046,7 +1441,7 @@ class PromptChain:
                         if scene_terms:
                             scene["search_terms"] = scene_terms
         except Exception as e:
-            print(f"Error distributing search terms: {e}")
+            logger.warning(f"Error distributing search terms: {e}")
             
         # Add full script if available
         if "detailed_script" in self.results:
@@ -1054,6 +1449,104 @@ class PromptChain:
             
         return output
     
+    async def _generate_with_retry(self, prompt, accept, step, generate=None):
+        """Call the model until a response passes local parsing and validation
+
+        Parsing is kept separate from calling: every response goes through the
+        full local cascade in accept(), run in a worker thread, before the
+        model is asked again, and only failed calls wait (with jittered
+        backoff) before retrying.
+
+        Args:
+            prompt (str): The prompt to send to the AI
+            accept (callable): Takes the raw response and returns the parsed
+                result, or None to reject it
+            step (str): Step name used in log messages
+            generate (callable): Coroutine function making the call, defaults
+                to _generate_content
+
+        Returns:
+            tuple: (accepted result or None, last raw response or None)
+
+        Raises:
+            Exception: The last call error, if the final attempt failed
+        """
+        generate = generate or self._generate_content
+        wait_time = 0
+        response = None
+        for attempt in range(self.max_retries):
+            try:
+                response = await generate(prompt)
+            except Exception as e:
+                logger.warning(f"{step} generation attempt {attempt+1} failed: {e}")
+                if attempt == self.max_retries - 1:
+                    raise
+                wait_time = decorrelated_backoff(wait_time, cap=8.0)
+                await asyncio.sleep(wait_time)
+                continue
+
+            try:
+                # Parsing is CPU work, keep it off the event loop
+                result = await asyncio.to_thread(accept, response)
+            except Exception as e:
+                logger.warning(f"Error validating {step.lower()} response: {e}")
+                result = None
+            if result is not None:
+                return result, response
+            logger.warning(f"Could not use {step.lower()} response, attempt {attempt+1}")
+        return None, response
+
+    def _get_cached(self, prompt):
+        """Return a cached response for a prompt's first use in this run
+
+        Args:
+            prompt (str): The prompt about to be sent
+
+        Returns:
+            str: The cached response, or None if the model must be called
+        """
+        if prompt in self._sent_prompts:
+            return None
+        self._sent_prompts.add(prompt)
+        return prompt_cache.get(prompt, GEMINI_MODEL_ID)
+
+    async def _generate_json_content(self, prompt):
+        """Generate a response that should hold one JSON object, via streaming
+
+        The stream is read only until the object's closing brace arrives, so
+        any commentary the model appends afterwards is never waited for.
+
+        Args:
+            prompt (str): The prompt to send to the AI
+
+        Returns:
+            str: Generated content up to the end of the JSON object
+        """
+        cached = self._get_cached(prompt)
+        if cached is not None:
+            return cached
+
+        parts = []
+        scanner = _JsonObjectScanner()
+
+        async def consume():
+            stream = astream_script_with_gemini(prompt)
+            try:
+                async for chunk in stream:
+                    parts.append(chunk)
+                    if scanner.feed(chunk):
+                        break
+            finally:
+                await stream.aclose()
+
+        try:
+            await asyncio.wait_for(consume(), timeout=self.step_timeout)
+        except Exception as e:
+            return await self._generate_locally(prompt, e)
+        response = "".join(parts)
+        prompt_cache.put(prompt, GEMINI_MODEL_ID, response)
+        return response
+
     async def _generate_content(self, prompt):
         """Generate content using Google Gemini AI
         
@@ -1063,8 +1556,41 @@ class PromptChain:
         Returns:
             str: Generated content from Gemini
         """
-        # Use Google Gemini for content generation
-        return await generate_script_with_gemini(prompt)
+        cached = self._get_cached(prompt)
+        if cached is not None:
+            return cached
+
+        # Use Google Gemini for content generation. The step timeout bounds the
+        # whole call including its internal retries, so a hung request turns
+        # into an exception the step's own retry/fallback logic can handle
+        try:
+            response = await asyncio.wait_for(agenerate_script_with_gemini(prompt),
+                                              timeout=self.step_timeout)
+        except Exception as e:
+            return await self._generate_locally(prompt, e)
+        prompt_cache.put(prompt, GEMINI_MODEL_ID, response)
+        return response
+
+    async def _generate_locally(self, prompt, error):
+        """Answer a prompt with the local fallback model after Gemini failed
+
+        Local answers are not written to the prompt cache, so the next run
+        asks Gemini again.
+
+        Args:
+            prompt (str): The prompt to send to the AI
+            error (Exception): The error from the Gemini call
+
+        Returns:
+            str: Generated content from the local model
+
+        Raises:
+            Exception: The original error, if no local model is configured
+        """
+        if not local_llm.is_available():
+            raise error
+        logger.warning(f"Gemini request failed ({error}), using local fallback model")
+        return await asyncio.to_thread(local_llm.generate, prompt, 1024)
 
 
 async def generate_top10_content(title, genre="", language="english"):
@@ -5,7 +5,7 @@ import traceback
 import time
 
 from lib.video_texts import get_names, process_text, getyamll, read_random_line, get_item_content, get_intro_text
-from lib.config_utils import read_config_file
+from lib.config_utils import read_config_view, get_config_value
 from lib.image_procces import getim, delete_invalid_images, sortimage, shape_error
 from lib.media_api import download_file, translateto, enhance_search_term, get_videos
 from lib.video_editor import mergevideo
@@ -54,7 +54,7 @@ def intro(title):
         
         audio_file = os.path.join(intro_dir, "11.mp3")
         try:
-            generate_voice(introtext, audio_file, get_language_code(read_config_file()["language"]))
+            generate_voice(introtext, audio_file, get_language_code(read_config_view()["language"]))
             print("Intro audio generated successfully")
         except Exception as e:
             print(f"Error generating intro voice: {e}")
@@ -70,7 +70,7 @@ def top10s(top10, genre, title):
     temp_dir = get_temp_dir()
     
     try:
-        language = read_config_file()["language"]
+        language = read_config_view()["language"]
     except Exception as e:
         print(f"Error reading language from config: {e}")
         language = "english"  # Default language
@@ -79,7 +79,7 @@ def top10s(top10, genre, title):
     
     # Calculate time per item
     try:
-        total_minutes = int(read_config_file().get("time", "5"))
+        total_minutes = int(get_config_value("time", "5"))
         time_per_item = int((total_minutes * 60) / 10)  # seconds per item
     except Exception as e:
         print(f"Error calculating time per item: {e}")
@@ -175,7 +175,7 @@ def outro():
             # Generate outro audio
             audio_path = os.path.join(outro_dir, "0.mp3")
             outro_text = getyamll("outro_text")
-            language_code = get_language_code(read_config_file().get("language", "english"))
+            language_code = get_language_code(get_config_value("language", "english"))
             translated_outro = translateto(outro_text, language_code)
             generate_voice(translated_outro, audio_path, language_code)
             
@@ -241,7 +241,7 @@ def making_video(title, genre=""):
     try:
         # Get the genre
         try:
-            genre = read_config_file()["general_topic"]
+            genre = read_config_view()["general_topic"]
         except Exception as e:
             print(f"Error reading genre from config: {e}")
             if not genre:  # Only use default if no genre was provided as parameter
@@ -348,7 +348,7 @@ def making_video(title, genre=""):
 def make_intro(title):
     """Make video intro with optional video instead of image"""
     try:
-        withvideo = read_config_file()["intro_video"].lower() in ["yes", "true", "1"]
+        withvideo = read_config_view()["intro_video"].lower() in ["yes", "true", "1"]
     except Exception as e:
         print(f"Error reading intro_video setting: {e}")
         withvideo = False
@@ -356,7 +356,7 @@ def make_intro(title):
     if withvideo:
         try:
             # Check if we should use Gemini to enhance the video search
-            use_gemini = read_config_file().get('use_gemini', 'no').lower() in ['yes', 'true', '1']
+            use_gemini = get_config_value('use_gemini', 'no').lower() in ['yes', 'true', '1']
             
             search_title = title
             if use_gemini:
@@ -405,7 +405,7 @@ def making_video_optimized(title, genre=""):
     try:
         # Get the genre
         try:
-            genre = read_config_file()["general_topic"]
+            genre = read_config_view()["general_topic"]
         except Exception as e:
             print(f"Error reading genre from config: {e}")
             if not genre:  # Only use default if no genre was provided as parameter
@@ -420,7 +420,7 @@ def making_video_optimized(title, genre=""):
         # Get all content in a single API call
         try:
             print("\n----- Generating all content with a single Gemini API call -----")
-            language = read_config_file().get("language", "english")
+            language = get_config_value("language", "english")
             complete_content = generate_complete_top10_content(title, genre, language)
             
             if not complete_content:
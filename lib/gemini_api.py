@@ -1,9 +1,44 @@
 import os
+import atexit
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import re
-from lib.config_utils import read_config_file
+from lib.config_utils import (
+    get_config_value,
+    decorrelated_backoff,
+    compute_rate_limit_backoff,
+    intelligent_rate_limit_handling,
+    check_circuit,
+    release_circuit_probe,
+    record_api_success,
+    record_api_failure,
+)
+
+GEMINI_MODEL_ID = "gemini-2.5-flash-preview-04-17"
+GEMINI_GENERATE_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL_ID}:generateContent"
+GEMINI_STREAM_URL = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL_ID}:streamGenerateContent"
+GEMINI_HEADERS = {
+    "Content-Type": "application/json",
+}
+
+# Pooled session for the synchronous calls so retries and later prompts
+# reuse the TLS connection to the Gemini endpoint
+_SESSION = requests.Session()
+_SESSION.headers.update(GEMINI_HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0))
+
+# Shared aiohttp session for agenerate_script_with_gemini, created lazily on
+# the running loop so keep-alive connections are reused across prompts
+_gemini_session = None
+_gemini_session_loop = None
+_gemini_limiter = None
+
+# Upper bound on concurrent generateContent requests from the async path
+GEMINI_MAX_CONCURRENCY = max(1, int(os.environ.get("GEMINI_MAX_CONCURRENCY", "4")))
 
 def get_gemini_key():
     """Get Gemini API key from environment variable or config file"""
@@ -13,7 +48,7 @@ def get_gemini_key():
     # If not found in env vars, try to get from config file
     if not api_key:
         try:
-            api_key = read_config_file().get('gemini_api', '')
+            api_key = get_config_value('gemini_api', '')
         except Exception as e:
             print(f"Warning: Could not read config file: {e}")
             api_key = ''
@@ -41,7 +76,7 @@ def list_available_gemini_models(api_key=None):
         url = "https://generativelanguage.googleapis.com/v1beta/models"
         params = {"key": api_key}
         
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code == 200:
             models_data = response.json()
@@ -142,6 +177,63 @@ def get_gemini_model():
     # Always return our fixed model
     return 'models/gemini-2.5-flash-preview-04-17'
 
+def _gemini_payload(prompt):
+    """Build the generateContent request body for a prompt
+    
+    Args:
+        prompt: The prompt to send to Gemini
+        
+    Returns:
+        The JSON-serializable request body
+    """
+    return {
+        "contents": [
+            {
+                "parts": [
+                    {
+                        "text": prompt
+                    }
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": 0.7,
+            "topK": 40,
+            "topP": 0.95,
+            "maxOutputTokens": 8192
+        }
+    }
+
+def _extract_gemini_text(result):
+    """Pull the generated text out of a generateContent response
+    
+    Args:
+        result: The decoded JSON response
+        
+    Returns:
+        The generated text
+    """
+    try:
+        return result["candidates"][0]["content"]["parts"][0]["text"]
+    except (KeyError, IndexError) as e:
+        print(f"Error parsing Gemini response: {e}")
+        print(f"Response structure: {json.dumps(result, indent=2)[:500]}...")
+        raise Exception(f"Unexpected Gemini API response format: {e}")
+
+def _retry_after(headers):
+    """Read a Retry-After header given in seconds
+    
+    Args:
+        headers: Response headers (case-insensitive mapping)
+        
+    Returns:
+        The delay in seconds, or None if absent or not a number
+    """
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
 def generate_script_with_gemini(prompt, api_key=None, max_retries=3):
     """Generate script using Gemini API with the fixed model gemini-2.5-flash-preview-04-17
     
@@ -159,62 +251,30 @@ def generate_script_with_gemini(prompt, api_key=None, max_retries=3):
     if not api_key:
         raise ValueError("Gemini API key not found. Please set GEMINI_API_KEY environment variable or add 'gemini_api = YOUR_API_KEY' to config.txt")
     
-    # Use our fixed model
-    model_name = get_gemini_model()
-    model_id = "gemini-2.5-flash-preview-04-17"  # Fixed model ID
-    
-    # Always use v1beta API for this model
-    api_version = "v1beta"
-    
-    # Use the correct API endpoint format with appropriate version
-    url = f"https://generativelanguage.googleapis.com/{api_version}/models/{model_id}:generateContent"
+    url = GEMINI_GENERATE_URL
     print(f"Using API endpoint: {url}")
     
-    headers = {
-        "Content-Type": "application/json",
-    }
-    
     params = {
         "key": api_key
     }
     
-    data = {
-        "contents": [
-            {
-                "parts": [
-                    {
-                        "text": prompt
-                    }
-                ]
-            }
-        ],
-        "generationConfig": {
-            "temperature": 0.7,
-            "topK": 40,
-            "topP": 0.95,
-            "maxOutputTokens": 8192
-        }
-    }
+    data = _gemini_payload(prompt)
     
+    wait_time = 0
     retries = 0
     while retries < max_retries:
+        # Fail fast while the endpoint is known to be down
+        probe = check_circuit("gemini_api")
         try:
-            response = requests.post(url, headers=headers, params=params, json=data)
+            response = _SESSION.post(url, params=params, json=data, timeout=60)
             
             if response.status_code == 200:
-                result = response.json()
-                try:
-                    generated_text = result["candidates"][0]["content"]["parts"][0]["text"]
-                    return generated_text
-                except (KeyError, IndexError) as e:
-                    print(f"Error parsing Gemini response: {e}")
-                    print(f"Response structure: {json.dumps(result, indent=2)[:500]}...")
-                    raise Exception(f"Unexpected Gemini API response format: {e}")
+                record_api_success("gemini_api")
+                return _extract_gemini_text(response.json())
             elif response.status_code == 429:
-                # Rate limit - wait and retry with exponential backoff
-                wait_time = min(2 ** retries, 60)  # Exponential backoff up to 60 seconds
-                print(f"Rate limit hit with model gemini-2.5-flash-preview-04-17. Waiting {wait_time} seconds before retrying...")
-                time.sleep(wait_time)
+                # Rate limit - back off using the shared Gemini rate limit state
+                print("Rate limit hit with model gemini-2.5-flash-preview-04-17.")
+                intelligent_rate_limit_handling(_retry_after(response.headers), "gemini_api")
             elif response.status_code == 400:
                 error_message = "Invalid request"
                 try:
@@ -230,21 +290,276 @@ def generate_script_with_gemini(prompt, api_key=None, max_retries=3):
                 raise Exception(f"Gemini API error (400) with model gemini-2.5-flash-preview-04-17: {error_message}")
             else:
                 print(f"Gemini API error with model gemini-2.5-flash-preview-04-17: {response.status_code} - {response.text}")
+                if response.status_code >= 500:
+                    record_api_failure("gemini_api")
                 # For other errors, retry
         except requests.RequestException as e:
+            record_api_failure("gemini_api")
             print(f"Request error with model gemini-2.5-flash-preview-04-17: {e}")
             if retries < max_retries - 1:
-                wait_time = min(2 ** retries, 60)
-                print(f"Retrying in {wait_time} seconds...")
+                wait_time = decorrelated_backoff(wait_time, cap=60.0)
+                print(f"Retrying in {wait_time:.2f} seconds...")
                 time.sleep(wait_time)
             else:
                 raise Exception(f"Failed to connect to Gemini API with model gemini-2.5-flash-preview-04-17 after {max_retries} attempts: {e}")
+        finally:
+            release_circuit_probe("gemini_api", probe)
         
         retries += 1
     
     # If we've exhausted all retries
     raise Exception(f"Failed to get a valid response from Gemini API with model gemini-2.5-flash-preview-04-17 after {max_retries} attempts. The model may be rate-limited or experiencing issues.")
 
+class _AdaptiveLimiter:
+    """Concurrency limit that halves on rate limits and creeps back up
+    
+    Additive-increase / multiplicative-decrease: every 429 halves the number
+    of requests allowed in flight, and each run of successes raises it by
+    one, up to the configured maximum.
+    """
+    
+    def __init__(self, max_limit, increase_after=5):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.in_flight = 0
+        self.increase_after = increase_after
+        self._successes = 0
+        self._cond = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+    
+    def on_success(self):
+        """Record a successful request, raising the limit after a streak"""
+        self._successes += 1
+        if self._successes >= self.increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+    
+    def on_throttle(self):
+        """Record a rate limit response by halving the limit"""
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+
+async def _get_gemini_session():
+    """Get the shared Gemini session, creating it on the running loop
+    
+    Returns:
+        aiohttp.ClientSession: Session with a pooled keep-alive connector
+    """
+    global _gemini_session, _gemini_session_loop, _gemini_limiter
+    loop = asyncio.get_running_loop()
+    if _gemini_session is None or _gemini_session.closed or _gemini_session_loop is not loop:
+        _gemini_session = aiohttp.ClientSession(
+            headers=GEMINI_HEADERS,
+            connector=aiohttp.TCPConnector(limit=32, limit_per_host=16, ttl_dns_cache=300,
+                                         keepalive_timeout=60)
+        )
+        _gemini_session_loop = loop
+        _gemini_limiter = _AdaptiveLimiter(GEMINI_MAX_CONCURRENCY)
+    return _gemini_session
+
+async def close_gemini_session():
+    """Close the shared Gemini session if one is open"""
+    global _gemini_session, _gemini_session_loop
+    if _gemini_session is not None and not _gemini_session.closed:
+        await _gemini_session.close()
+    _gemini_session = None
+    _gemini_session_loop = None
+
+def _close_gemini_session_at_exit():
+    """Close a session left open by a caller that never awaited close_gemini_session"""
+    if _gemini_session is None or _gemini_session.closed:
+        return
+    if _gemini_session_loop is not None and not _gemini_session_loop.is_closed() \
+            and not _gemini_session_loop.is_running():
+        _gemini_session_loop.run_until_complete(close_gemini_session())
+
+atexit.register(_close_gemini_session_at_exit)
+
+async def agenerate_script_with_gemini(prompt, api_key=None, max_retries=3):
+    """Async variant of generate_script_with_gemini for use inside an event loop
+    
+    Requests go through a shared aiohttp session so the TLS connection is
+    reused across retries and prompts, and waits never block the loop.
+    Concurrent calls share an adaptive limit (GEMINI_MAX_CONCURRENCY) that
+    backs off when Gemini starts returning 429s.
+    
+    Args:
+        prompt: The prompt to send to Gemini
+        api_key: Optional Gemini API key, if not provided will try to get from env/config
+        max_retries: Maximum number of retries on failure
+        
+    Returns:
+        The generated text from Gemini
+    """
+    if not api_key:
+        api_key = get_gemini_key()
+        
+    if not api_key:
+        raise ValueError("Gemini API key not found. Please set GEMINI_API_KEY environment variable or add 'gemini_api = YOUR_API_KEY' to config.txt")
+    
+    params = {
+        "key": api_key
+    }
+    data = _gemini_payload(prompt)
+    timeout = aiohttp.ClientTimeout(total=60)
+    session = await _get_gemini_session()
+    limiter = _gemini_limiter
+    
+    wait_time = 0
+    retries = 0
+    while retries < max_retries:
+        # Fail fast while the endpoint is known to be down
+        probe = check_circuit("gemini_api")
+        rate_limited = False
+        try:
+            # Only the request holds a slot; backoff sleeps happen outside it
+            async with limiter, session.post(GEMINI_GENERATE_URL, params=params, json=data,
+                                             timeout=timeout) as response:
+                if response.status == 200:
+                    record_api_success("gemini_api")
+                    limiter.on_success()
+                    return _extract_gemini_text(await response.json())
+                elif response.status == 429:
+                    limiter.on_throttle()
+                    wait_time = compute_rate_limit_backoff(_retry_after(response.headers), "gemini_api")
+                    print(f"Rate limit hit with model {GEMINI_MODEL_ID}. Waiting {wait_time:.2f} seconds before retrying...")
+                    rate_limited = True
+                elif response.status == 400:
+                    error_message = "Invalid request"
+                    try:
+                        error_data = await response.json(content_type=None)
+                        if "error" in error_data and "message" in error_data["error"]:
+                            error_message = error_data["error"]["message"]
+                    except Exception:
+                        pass
+                    print(f"Gemini API error with model {GEMINI_MODEL_ID} (400): {error_message}")
+                    raise Exception(f"Gemini API error (400) with model {GEMINI_MODEL_ID}: {error_message}")
+                else:
+                    print(f"Gemini API error with model {GEMINI_MODEL_ID}: {response.status} - {await response.text()}")
+                    if response.status >= 500:
+                        record_api_failure("gemini_api")
+            if rate_limited:
+                await asyncio.sleep(wait_time)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            record_api_failure("gemini_api")
+            print(f"Request error with model {GEMINI_MODEL_ID}: {e}")
+            if retries < max_retries - 1:
+                wait_time = decorrelated_backoff(wait_time, cap=60.0)
+                print(f"Retrying in {wait_time:.2f} seconds...")
+                await asyncio.sleep(wait_time)
+            else:
+                raise Exception(f"Failed to connect to Gemini API with model {GEMINI_MODEL_ID} after {max_retries} attempts: {e}")
+        finally:
+            release_circuit_probe("gemini_api", probe)
+        
+        retries += 1
+    
+    raise Exception(f"Failed to get a valid response from Gemini API with model {GEMINI_MODEL_ID} after {max_retries} attempts. The model may be rate-limited or experiencing issues.")
+
+def _extract_stream_text(chunk):
+    """Pull the text out of one streamGenerateContent chunk
+    
+    Args:
+        chunk: The decoded JSON of one server-sent event
+        
+    Returns:
+        The text in the chunk, or an empty string for chunks without text
+    """
+    try:
+        return "".join(part.get("text", "") for part in chunk["candidates"][0]["content"]["parts"])
+    except (KeyError, IndexError, TypeError):
+        return ""
+
+async def astream_script_with_gemini(prompt, api_key=None, max_retries=3):
+    """Stream generated text from Gemini as it is produced
+    
+    Uses the same shared session, concurrency limit and circuit breaker as
+    agenerate_script_with_gemini. Failed attempts are retried only until the
+    first chunk has been yielded; after that errors are raised to the caller.
+    
+    Args:
+        prompt: The prompt to send to Gemini
+        api_key: Optional Gemini API key, if not provided will try to get from env/config
+        max_retries: Maximum number of retries on failure
+        
+    Yields:
+        Successive pieces of the generated text
+    """
+    if not api_key:
+        api_key = get_gemini_key()
+        
+    if not api_key:
+        raise ValueError("Gemini API key not found. Please set GEMINI_API_KEY environment variable or add 'gemini_api = YOUR_API_KEY' to config.txt")
+    
+    params = {
+        "key": api_key,
+        "alt": "sse"
+    }
+    data = _gemini_payload(prompt)
+    # Bound the gap between chunks rather than the whole stream
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+    session = await _get_gemini_session()
+    limiter = _gemini_limiter
+    
+    wait_time = 0
+    retries = 0
+    started = False
+    while retries < max_retries:
+        probe = check_circuit("gemini_api")
+        rate_limited = False
+        try:
+            async with limiter, session.post(GEMINI_STREAM_URL, params=params, json=data,
+                                             timeout=timeout) as response:
+                if response.status == 200:
+                    record_api_success("gemini_api")
+                    limiter.on_success()
+                    async for line in response.content:
+                        if not line.startswith(b"data:"):
+                            continue
+                        text = _extract_stream_text(json.loads(line[5:]))
+                        if text:
+                            started = True
+                            yield text
+                    return
+                elif response.status == 429:
+                    limiter.on_throttle()
+                    wait_time = compute_rate_limit_backoff(_retry_after(response.headers), "gemini_api")
+                    print(f"Rate limit hit with model {GEMINI_MODEL_ID}. Waiting {wait_time:.2f} seconds before retrying...")
+                    rate_limited = True
+                elif response.status == 400:
+                    print(f"Gemini API error with model {GEMINI_MODEL_ID} (400): {await response.text()}")
+                    raise Exception(f"Gemini API error (400) with model {GEMINI_MODEL_ID}")
+                else:
+                    print(f"Gemini API error with model {GEMINI_MODEL_ID}: {response.status} - {await response.text()}")
+                    if response.status >= 500:
+                        record_api_failure("gemini_api")
+            if rate_limited:
+                await asyncio.sleep(wait_time)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            record_api_failure("gemini_api")
+            print(f"Request error with model {GEMINI_MODEL_ID}: {e}")
+            if started or retries >= max_retries - 1:
+                raise Exception(f"Gemini stream with model {GEMINI_MODEL_ID} failed: {e}")
+            wait_time = decorrelated_backoff(wait_time, cap=60.0)
+            print(f"Retrying in {wait_time:.2f} seconds...")
+            await asyncio.sleep(wait_time)
+        finally:
+            release_circuit_probe("gemini_api", probe)
+        
+        retries += 1
+    
+    raise Exception(f"Failed to get a valid response from Gemini API with model {GEMINI_MODEL_ID} after {max_retries} attempts. The model may be rate-limited or experiencing issues.")
+
 def enhance_media_search_with_gemini(script, segment_count=5, api_key=None, max_retries=2):
     """Analyze a script and suggest better media search terms for each segment
     
@@ -11,7 +11,7 @@ import json
 import base64
 import time
 import traceback
-from lib.config_utils import read_config_file
+from lib.config_utils import get_config_value
 
 def get_gemini_key():
     """Get Gemini API key from environment variable or config file
@@ -25,7 +25,7 @@ def get_gemini_key():
     # If not found in env vars, try to get from config file
     if not api_key:
         try:
-            api_key = read_config_file().get('gemini_api', '')
+            api_key = get_config_value('gemini_api', '')
         except Exception as e:
             print(f"Warning: Could not read config file for Gemini API key: {e}")
             api_key = ''
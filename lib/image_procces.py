@@ -6,12 +6,12 @@ import json
 import hashlib
 
 from lib.media_api import getBingImages, enhance_search_term
-from lib.config_utils import read_config_file
+from lib.config_utils import get_config_value
 
 
 def getim(top, paths):
     # Check if we should use Gemini to enhance the search terms
-    use_gemini = read_config_file().get('use_gemini', 'no').lower() in ['yes', 'true', '1']
+    use_gemini = get_config_value('use_gemini', 'no').lower() in ['yes', 'true', '1']
     
     if use_gemini:
         # Enhance the search term using Gemini
@@ -101,6 +101,27 @@ def sortimage(path):
           os.rename(os.path.join(path, file), os.path.join(path, str(counter) + ".jpg"))
           counter += 1
 
+def process_images_fused(path):
+    # Same result as delete_invalid_images + sortimage + shape_error, but each
+    # image is read and decoded once: undecodable files are deleted and the
+    # rest are renamed to 1.jpg, 2.jpg, ... in a single walk of the folder
+    valid = []
+    for file in sorted(os.listdir(path)):
+        if not file.lower().endswith((".jpg", ".jpeg", ".png")):
+            continue
+        filepath = os.path.join(path, file)
+        img = cv2.imread(filepath)
+        if img is None or img.ndim != 3:
+            delete_image(filepath)
+            print(file + " delete:invalid image")
+            continue
+        valid.append(filepath)
+    # Two-step rename so a new name never overwrites a file not yet moved
+    for counter, filepath in enumerate(valid, 1):
+        os.rename(filepath, os.path.join(path, str(counter) + "q.jpg"))
+    for counter in range(1, len(valid) + 1):
+        os.rename(os.path.join(path, str(counter) + "q.jpg"), os.path.join(path, str(counter) + ".jpg"))
+
 
 def resize_and_add_borders(img, target_width, target_height):
     height, width, _ = img.shape
@@ -1,3 +1,5 @@
+import functools
+
 language_codes = {
     'english': 'en',
     'persian': 'fa',
@@ -75,5 +77,6 @@ language_codes = {
     'uzbek': 'uz'
 }
 
+@functools.lru_cache(maxsize=32)
 def get_language_code(language):
     return language_codes.get(language.lower(), "Language code not found")
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Local LLM Fallback for UnQTube
+
+This module runs a small quantized GGUF model (for example Gemma-2B-Instruct
+Q4_K_M or Phi-3-mini Q4) on the CPU through llama-cpp-python. It is only
+used when the Gemini API cannot be reached, so content generation degrades
+to a weaker model instead of hardcoded placeholder text.
+
+The fallback is off unless llama-cpp-python is installed and a model file
+is configured, either with the LOCAL_LLM_MODEL environment variable or a
+'local_llm_model = path/to/model.gguf' line in config.txt.
+"""
+
+import os
+import threading
+
+from lib.config_utils import get_config_value
+
+try:
+    from llama_cpp import Llama
+except ImportError:
+    Llama = None
+
+__all__ = [
+    "get_model_path",
+    "is_available",
+    "generate",
+]
+
+_llm = None
+_llm_lock = threading.Lock()
+
+
+def get_model_path():
+    """Get the configured GGUF model path
+
+    Returns:
+        str: Path to the model file, or an empty string if none is configured
+    """
+    path = os.environ.get("LOCAL_LLM_MODEL")
+    if not path:
+        try:
+            path = get_config_value("local_llm_model", "")
+        except Exception as e:
+            print(f"Warning: Could not read config file: {e}")
+            path = ""
+    return path
+
+
+def is_available():
+    """Check whether the local fallback model can be used
+
+    Returns:
+        bool: True if llama-cpp-python is installed and the model file exists
+    """
+    if Llama is None:
+        return False
+    path = get_model_path()
+    return bool(path) and os.path.isfile(path)
+
+
+def _get_llm():
+    """Load the model on first use
+
+    Returns:
+        Llama: The shared model instance
+    """
+    global _llm
+    if _llm is None:
+        path = get_model_path()
+        print(f"Loading local fallback model {os.path.basename(path)}...")
+        _llm = Llama(
+            model_path=path,
+            n_ctx=4096,
+            n_batch=512,
+            n_threads=os.cpu_count(),
+            verbose=False
+        )
+    return _llm
+
+
+def generate(prompt, max_tokens=1024):
+    """Generate text with the local model
+
+    Blocking and CPU-bound; async callers should run it in a thread.
+
+    Args:
+        prompt (str): The prompt to complete
+        max_tokens (int): Maximum number of tokens to generate
+
+    Returns:
+        str: The generated text
+    """
+    if not is_available():
+        raise RuntimeError("Local fallback model is not available. Install llama-cpp-python and set LOCAL_LLM_MODEL or 'local_llm_model' in config.txt")
+
+    # llama.cpp contexts are not safe to share between threads
+    with _llm_lock:
+        result = _get_llm().create_chat_completion(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=0.7
+        )
+    return result["choices"][0]["message"]["content"]
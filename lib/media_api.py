@@ -3,7 +3,7 @@ import requests
 import urllib.parse
 from deep_translator import GoogleTranslator
 import os
-from lib.config_utils import read_config_file
+from lib.config_utils import read_config_view, maybe_preemptive_wait, record_rate_limit_headers
 
 #images API (Bing)
 def _extractBingImages(html):
@@ -38,7 +38,7 @@ def getBingImages(texts, retries=5):
 def get_videos(title):
   url = "https://api.pexels.com/videos/search"
   headers = {
-      "Authorization": read_config_file()["pexels_api"]
+      "Authorization": read_config_view()["pexels_api"]
   }
   params = {
       "query": title,
@@ -46,7 +46,9 @@ def get_videos(title):
       "per_page": 30
   }
 
+  maybe_preemptive_wait("pexels_api")
   response = requests.get(url, headers=headers, params=params)
+  record_rate_limit_headers("pexels_api", response.headers)
   json_data = response.json()
 
   links = []
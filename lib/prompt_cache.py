@@ -0,0 +1,167 @@
+"""
+Prompt Cache for UnQTube
+
+This module keeps a persistent exact-match cache of LLM responses so that
+re-running the same prompt (same title, genre and language) skips the
+network round-trip entirely. Entries are keyed by a SHA-256 of the model id
+and prompt text and stored in a small SQLite database under ``cache/``.
+
+A cached run replays the earlier output word for word. Set the
+PROMPT_CACHE=0 environment variable or 'prompt_cache = no' in config.txt
+to always ask the model for fresh content.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+from lib.config_utils import get_config_value
+
+__all__ = [
+    "get",
+    "put",
+    "clear",
+    "is_enabled",
+    "PROMPT_CACHE_MAX_AGE",
+]
+
+# Anchored to the project directory so every working directory shares one cache
+_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "cache", "prompt_cache.sqlite3")
+
+_DISABLED_VALUES = ("0", "no", "false", "off")
+
+# Responses older than this are treated as misses (default: 7 days)
+PROMPT_CACHE_MAX_AGE = 86400 * 7
+
+_conn = None
+_conn_lock = threading.Lock()
+
+
+def _connect():
+    """Open the cache database on first use
+
+    Returns:
+        sqlite3.Connection: Shared connection to the cache database
+    """
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(_DB_PATH), exist_ok=True)
+        conn = sqlite3.connect(_DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS prompts ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL)"
+        )
+        _conn = conn
+    return _conn
+
+
+def is_enabled():
+    """Check whether cached responses may be used
+
+    The PROMPT_CACHE environment variable takes precedence over the
+    'prompt_cache' setting in config.txt; both default to enabled.
+
+    Returns:
+        bool: False if the cache has been switched off
+    """
+    setting = os.environ.get("PROMPT_CACHE")
+    if setting is None:
+        try:
+            setting = get_config_value("prompt_cache", "yes")
+        except Exception as e:
+            print(f"Warning: Could not read config file: {e}")
+            setting = "yes"
+    return str(setting).strip().lower() not in _DISABLED_VALUES
+
+
+def _key(prompt, model):
+    """Build the cache key for a prompt
+
+    Args:
+        prompt (str): Prompt text sent to the model
+        model (str): Model identifier
+
+    Returns:
+        str: Hex digest identifying the (model, prompt) pair
+    """
+    digest = hashlib.sha256(model.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get(prompt, model, max_age=PROMPT_CACHE_MAX_AGE):
+    """Look up a cached response for a prompt
+
+    Args:
+        prompt (str): Prompt text sent to the model
+        model (str): Model identifier
+        max_age (float): Maximum age in seconds of a usable entry
+
+    Returns:
+        str: Cached response, or None if there is no fresh entry or the
+            cache is disabled
+    """
+    if not is_enabled():
+        return None
+    try:
+        with _conn_lock:
+            row = _connect().execute(
+                "SELECT response, created FROM prompts WHERE key = ?",
+                (_key(prompt, model),),
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"Prompt cache read failed: {e}")
+        return None
+
+    if row is None or time.time() - row[1] > max_age:
+        return None
+    return row[0]
+
+
+def put(prompt, model, response):
+    """Store a response for a prompt
+
+    Args:
+        prompt (str): Prompt text sent to the model
+        model (str): Model identifier
+        response (str): Response text to cache
+    """
+    if not response or not is_enabled():
+        return
+    try:
+        with _conn_lock:
+            conn = _connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO prompts (key, response, created) VALUES (?, ?, ?)",
+                (_key(prompt, model), response, time.time()),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"Prompt cache write failed: {e}")
+
+
+def clear(max_age=None):
+    """Remove cached responses
+
+    Args:
+        max_age (float): If given, only remove entries older than this many
+            seconds; otherwise remove everything
+    """
+    try:
+        with _conn_lock:
+            conn = _connect()
+            if max_age is None:
+                conn.execute("DELETE FROM prompts")
+            else:
+                conn.execute("DELETE FROM prompts WHERE created < ?", (time.time() - max_age,))
+            conn.commit()
+    except sqlite3.Error as e:
+        print(f"Prompt cache clear failed: {e}")
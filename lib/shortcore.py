@@ -7,7 +7,7 @@ import traceback
 from moviepy.editor import VideoFileClip, concatenate_videoclips, AudioFileClip, CompositeAudioClip
 
 from lib.video_texts import getyamll, read_random_line
-from lib.config_utils import read_config_file
+from lib.config_utils import read_config_view, maybe_preemptive_wait, record_rate_limit_headers
 from lib.media_api import download_file, translateto
 from lib.voices import generate_voice
 from lib.language import get_language_code
@@ -21,7 +21,7 @@ def get_video(prompt, videoname, max_retries=3):
             url = "https://api.pexels.com/videos/search"
             
             try:
-                api_key = read_config_file()["pexels_api"]
+                api_key = read_config_view()["pexels_api"]
                 if not api_key or api_key == "pexels_api":
                     print("Warning: Invalid Pexels API key in config. Video downloads may fail.")
             except Exception as e:
@@ -36,7 +36,9 @@ def get_video(prompt, videoname, max_retries=3):
                 "per_page": 1
             }
 
+            maybe_preemptive_wait("pexels_api")
             response = requests.get(url, headers=headers, params=params, timeout=10)
+            record_rate_limit_headers("pexels_api", response.headers)
             
             if response.status_code != 200:
                 if attempt < max_retries - 1:
@@ -10,7 +10,7 @@ import time
 
 from lib.media_api import get_videos,download_file,enhance_search_term
 from lib.image_procces import resize_and_add_borders
-from lib.config_utils import read_config_file
+from lib.config_utils import get_config_value
 from lib.image_procces import getim,delete_invalid_images,sortimage,shape_error
 
 def create_video_with_images_and_audio(image_folder, audio_file, text, audio_volume=1.0):
@@ -91,14 +91,26 @@ def create_video_with_images_and_audio(image_folder, audio_file, text, audio_vol
         blank_clip = mp.ImageClip(blank_img).set_duration(5)
         return blank_clip
 
+def preencode_segment(segment_path, num, text):
+    """Render one numbered segment to segment.mp4 ahead of the final merge"""
+    try:
+        video_clip = create_video_with_images_and_audio(segment_path, f"{segment_path}/{num}.mp3", text)
+        video_clip.write_videofile(os.path.join(segment_path, "segment.mp4"), codec="libx264",
+                                   audio_codec="aac", preset="ultrafast", fps=24, logger=None)
+        print(f"✓ Segment {num} pre-encoded")
+        return True
+    except Exception as e:
+        print(f"Error pre-encoding segment {num}: {e}")
+        return False
+
 def make_intro(title):
     """Create intro video with fallback mechanisms"""
     try:
-        withvideo = read_config_file().get("intro_video", "no").lower() in ["yes", "true", "1"]
+        withvideo = get_config_value("intro_video", "no").lower() in ["yes", "true", "1"]
         if withvideo:
             try:
                 # Check if we should use Gemini to enhance the video search
-                use_gemini = read_config_file().get('use_gemini', 'no').lower() in ['yes', 'true', '1']
+                use_gemini = get_config_value('use_gemini', 'no').lower() in ['yes', 'true', '1']
                 
                 if use_gemini:
                     try:
@@ -313,8 +325,13 @@ def mergevideo(videoname, audio_file, tops, title):
                         cv2.imwrite(blank_path, blank_img)
                         print("✓ Created fallback blank image")
                     
-                    print(f"Creating video segment {ir}")
-                    video_clip = create_video_with_images_and_audio(segment_path, audio_path, top)
+                    preencoded_path = os.path.join(segment_path, "segment.mp4")
+                    if os.path.exists(preencoded_path) and os.path.getsize(preencoded_path) > 0:
+                        print(f"Using pre-encoded video segment {ir}")
+                        video_clip = VideoFileClip(preencoded_path)
+                    else:
+                        print(f"Creating video segment {ir}")
+                        video_clip = create_video_with_images_and_audio(segment_path, audio_path, top)
                     if video_clip:
                         video_clips.append(video_clip)
                         print(f"✓ Segment {ir} created successfully")
@@ -1,7 +1,7 @@
 import re
 import yaml
 import random
-from lib.config_utils import read_config_file
+from lib.config_utils import read_config_view
 from lib.gemini_api import generate_script_with_gemini, generate_top10_list
 
 def read_random_line(filename):
@@ -119,7 +119,7 @@ def process_text(text, keyword):
 
 def get_intro_text(title):
     """Generate intro text for a video"""
-    language = read_config_file()["language"]
+    language = read_config_view()["language"]
     prompt = getyamll("intro_prompt").format(title=title, language=language)
     
     try:
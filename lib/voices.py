@@ -5,7 +5,7 @@ import traceback
 from concurrent.futures import ThreadPoolExecutor
 import edge_tts
 from edge_tts import VoicesManager
-from lib.config_utils import read_config_file
+from lib.config_utils import read_config_view, get_config_value
 
 def generate_voice(text, outputfile, lang):
     """Generate voice using TTS system
@@ -23,7 +23,7 @@ def generate_voice(text, outputfile, lang):
     """
     try:
         # First attempt with Gemini TTS if configured to use it
-        use_gemini = read_config_file().get('use_gemini', 'no').lower() in ['yes', 'true', '1']
+        use_gemini = get_config_value('use_gemini', 'no').lower() in ['yes', 'true', '1']
         if use_gemini:
             try:
                 # Import here to avoid circular imports
@@ -39,7 +39,7 @@ def generate_voice(text, outputfile, lang):
                 voice_params = select_voice_parameters(text, content_type=content_type)
                 
                 # Get user-selected TTS model if specified
-                config = read_config_file()
+                config = read_config_view()
                 tts_model = config.get('tts_model', voice_params.get("model", "gemini-2.5-flash-preview-tts"))
                 voice_name = config.get('tts_voice', voice_params.get("voice_name", "Kore"))
                 
@@ -117,12 +117,12 @@ async def async_generate_voice(text, outputfile, lang):
             voice = voices.find(Language=lang)
             
         # Get voice based on multi_speaker setting
-        multi = read_config_file().get("multi_speaker", "no").lower()
+        multi = get_config_value("multi_speaker", "no").lower()
         if multi in ["yes", "true", "1"]: 
             speaker = random.choice(voice)["Name"]
         else:      
             try:
-                speaker = read_config_file("temp.txt")["speaker"]
+                speaker = read_config_view("temp.txt")["speaker"]
             except:
                 speaker = random.choice(voice)["Name"]
                 with open("temp.txt", "w") as file:
@@ -7,9 +7,8 @@ import io
 from contextlib import redirect_stdout
 from lib.core import making_video
 from lib.shortcore import final_video
-from lib.video_texts import read_config_file
-from lib.config_utils import update_config_file
-from lib.async_core import make_video_async, make_short_video_async, cleanup
+from lib.config_utils import read_config_file, update_config_file_many
+from lib.async_core import make_video_async, make_short_video_async, cleanup, new_event_loop
 
 # Dynamic model loading
 from lib.gemini_api import list_available_gemini_models, get_default_models
@@ -486,28 +485,32 @@ class ModernUnQTubeGUI:
         try:
             if tab_num == 1:
                 # Long video configuration
-                update_config_file('config.txt', 'general_topic', self.general_topic_var.get())
-                update_config_file('config.txt', 'time', self.time_var.get())
-                update_config_file('config.txt', 'intro_video', self.intro_video_var.get())
-                update_config_file('config.txt', 'pexels_api', self.pexels_api_var.get())
-                update_config_file('config.txt', 'language', self.language_var.get())
-                update_config_file('config.txt', 'multi_speaker', self.multi_speaker_var.get())
-                update_config_file('config.txt', 'use_gemini', self.use_gemini_var.get())
-                update_config_file('config.txt', 'text_model', self.text_model_var.get())
-                update_config_file('config.txt', 'tts_model', self.tts_model_var.get())
-                update_config_file('config.txt', 'tts_voice', self.tts_voice_var.get())
-                update_config_file('config.txt', 'gemini_api', self.gemini_api_var.get())
+                update_config_file_many('config.txt', {
+                    'general_topic': self.general_topic_var.get(),
+                    'time': self.time_var.get(),
+                    'intro_video': self.intro_video_var.get(),
+                    'pexels_api': self.pexels_api_var.get(),
+                    'language': self.language_var.get(),
+                    'multi_speaker': self.multi_speaker_var.get(),
+                    'use_gemini': self.use_gemini_var.get(),
+                    'text_model': self.text_model_var.get(),
+                    'tts_model': self.tts_model_var.get(),
+                    'tts_voice': self.tts_voice_var.get(),
+                    'gemini_api': self.gemini_api_var.get(),
+                })
             else:
                 # Short video configuration
-                update_config_file('config.txt', 'time', self.time2_var.get())
-                update_config_file('config.txt', 'language', self.language2_var.get())
-                update_config_file('config.txt', 'multi_speaker', self.multi_speaker2_var.get())
-                update_config_file('config.txt', 'pexels_api', self.pexels_api2_var.get())
-                update_config_file('config.txt', 'use_gemini', self.use_gemini2_var.get())
-                update_config_file('config.txt', 'text_model', self.text_model2_var.get())
-                update_config_file('config.txt', 'tts_model', self.tts_model2_var.get())
-                update_config_file('config.txt', 'tts_voice', self.tts_voice2_var.get())
-                update_config_file('config.txt', 'gemini_api', self.gemini_api2_var.get())
+                update_config_file_many('config.txt', {
+                    'time': self.time2_var.get(),
+                    'language': self.language2_var.get(),
+                    'multi_speaker': self.multi_speaker2_var.get(),
+                    'pexels_api': self.pexels_api2_var.get(),
+                    'use_gemini': self.use_gemini2_var.get(),
+                    'text_model': self.text_model2_var.get(),
+                    'tts_model': self.tts_model2_var.get(),
+                    'tts_voice': self.tts_voice2_var.get(),
+                    'gemini_api': self.gemini_api2_var.get(),
+                })
                 
             self.log_message("✅ Configuration saved successfully")
         except Exception as e:
@@ -562,7 +565,7 @@ class ModernUnQTubeGUI:
     def run_async_generation(self, func, *args):
         """Run async video generation in a separate thread"""
         def run_async():
-            loop = asyncio.new_event_loop()
+            loop = new_event_loop()
             asyncio.set_event_loop(loop)
             try:
                 # Capture output
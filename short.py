@@ -1,7 +1,7 @@
 import argparse
 import asyncio
 from lib.shortcore import final_video
-from lib.async_core import make_short_video_async, cleanup
+from lib.async_core import make_short_video_async, cleanup, run
 from lib.config_utils import read_config_file
 
 def parse_args():
@@ -17,16 +17,20 @@ def parse_args():
 async def main_async():
 	args = parse_args()
 	try:
-		# Import update_config_file from the correct module
-		from lib.config_utils import update_config_file
+		# Import update_config_file_many from the correct module
+		from lib.config_utils import update_config_file_many
 		
 		# Update config if pexels_api is provided
+		updates = {}
 		if args.pexels_api:
-			update_config_file('config.txt', 'pexels_api', args.pexels_api)
+			updates['pexels_api'] = args.pexels_api
 			
 		# Update other config values
-		update_config_file('config.txt', 'language', args.language)
-		update_config_file('config.txt', 'multi_speaker', args.multi_speaker)
+		updates.update({
+			'language': args.language,
+			'multi_speaker': args.multi_speaker,
+		})
+		update_config_file_many('config.txt', updates)
 		
 		# Use async version if requested (default)
 		if args.use_async.lower() in ['yes', 'y', 'true', '1']:
@@ -47,21 +51,25 @@ def main():
 	
 	# For backward compatibility, use the legacy synchronous version
 	try:
-		# Import update_config_file from the correct module
-		from lib.config_utils import update_config_file
+		# Import update_config_file_many from the correct module
+		from lib.config_utils import update_config_file_many
 		
 		# Update config if pexels_api is provided
+		updates = {}
 		if args.pexels_api:
-			update_config_file('config.txt', 'pexels_api', args.pexels_api)
+			updates['pexels_api'] = args.pexels_api
 			
 		# Update other config values
-		update_config_file('config.txt', 'language', args.language)
-		update_config_file('config.txt', 'multi_speaker', args.multi_speaker)
+		updates.update({
+			'language': args.language,
+			'multi_speaker': args.multi_speaker,
+		})
+		update_config_file_many('config.txt', updates)
 		
 		# Check if we should use async version
 		if args.use_async.lower() in ['yes', 'y', 'true', '1']:
 			print("\nUsing high-performance asynchronous processing\n")
-			asyncio.run(make_short_video_async(args.topic, int(args.time)))
+			run(make_short_video_async(args.topic, int(args.time)))
 		else:
 			print("\nUsing legacy synchronous processing\n")
 			final_video(args.topic, args.time, args.language, args.multi_speaker)
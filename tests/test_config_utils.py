@@ -0,0 +1,10 @@
+import importlib
+
+
+def test_module_imports():
+    assert importlib.import_module("lib.config_utils")
+
+
+def test_missing_config_file_reads_as_empty():
+    from lib.config_utils import read_config_file
+    assert read_config_file("/nonexistent") == {}
@@ -0,0 +1,22 @@
+from lib.content_generation import _extract_json_object, _iter_json_objects
+
+
+def test_lone_brace_before_object_is_skipped():
+    text = 'Remember to use {braces for keys. {"hook": "Hi", "points": []}'
+    assert list(_iter_json_objects(text)) == ['{"hook": "Hi", "points": []}']
+    assert _extract_json_object(text) == {"hook": "Hi", "points": []}
+
+
+def test_braces_inside_strings_are_ignored():
+    text = 'Here: {"a": "}{", "b": {"c": 1}} trailing }'
+    assert _extract_json_object(text) == {"a": "}{", "b": {"c": 1}}
+
+
+def test_first_object_failing_validation_falls_through():
+    text = '{"hook": 1} {"hook": 2, "points": []}'
+    assert _extract_json_object(text, lambda obj: "points" in obj) == {"hook": 2, "points": []}
+
+
+def test_object_after_many_unclosed_braces():
+    text = "notes {a " * 1000 + '{"hook": "Hi", "points": []}'
+    assert list(_iter_json_objects(text)) == ['{"hook": "Hi", "points": []}']
@@ -1,7 +1,7 @@
 import argparse
 import asyncio
 from lib.core import making_video
-from lib.async_core import make_video_async, cleanup
+from lib.async_core import make_video_async, cleanup, run
 from lib.config_utils import read_config_file
 
 def parse_args():
@@ -19,19 +19,23 @@ def parse_args():
 async def main_async():
 	args = parse_args()
 	try:
-		# Import update_config_file from the correct module
-		from lib.config_utils import update_config_file
+		# Import update_config_file_many from the correct module
+		from lib.config_utils import update_config_file_many
 		
 		# Update config if pexels_api is provided
+		updates = {}
 		if args.pexels_api:
-			update_config_file('config.txt', 'pexels_api', args.pexels_api)
+			updates['pexels_api'] = args.pexels_api
 
 		# Update other config values
-		update_config_file('config.txt', 'general_topic', args.general_topic)
-		update_config_file('config.txt', 'time', args.time)
-		update_config_file('config.txt', 'intro_video', args.intro_video)
-		update_config_file('config.txt', 'language', args.language)
-		update_config_file('config.txt', 'multi_speaker', args.multi_speaker)
+		updates.update({
+			'general_topic': args.general_topic,
+			'time': args.time,
+			'intro_video': args.intro_video,
+			'language': args.language,
+			'multi_speaker': args.multi_speaker,
+		})
+		update_config_file_many('config.txt', updates)
 		
 		# Use async version if requested (default)
 		if args.use_async.lower() in ['yes', 'y', 'true', '1']:
@@ -52,24 +56,28 @@ def main():
 	
 	# For backward compatibility, use the legacy synchronous version
 	try:
-		# Import update_config_file from the correct module
-		from lib.config_utils import update_config_file
+		# Import update_config_file_many from the correct module
+		from lib.config_utils import update_config_file_many
 		
 		# Update config if pexels_api is provided
+		updates = {}
 		if args.pexels_api:
-			update_config_file('config.txt', 'pexels_api', args.pexels_api)
+			updates['pexels_api'] = args.pexels_api
 			
 		# Update other config values
-		update_config_file('config.txt', 'general_topic', args.general_topic)
-		update_config_file('config.txt', 'time', args.time)
-		update_config_file('config.txt', 'intro_video', args.intro_video)
-		update_config_file('config.txt', 'language', args.language)
-		update_config_file('config.txt', 'multi_speaker', args.multi_speaker)
+		updates.update({
+			'general_topic': args.general_topic,
+			'time': args.time,
+			'intro_video': args.intro_video,
+			'language': args.language,
+			'multi_speaker': args.multi_speaker,
+		})
+		update_config_file_many('config.txt', updates)
 		
 		# Check if we should use async version
 		if args.use_async.lower() in ['yes', 'y', 'true', '1']:
 			print("\nUsing high-performance asynchronous processing\n")
-			asyncio.run(make_video_async(args.topic, args.general_topic))
+			run(make_video_async(args.topic, args.general_topic))
 		else:
 			print("\nUsing legacy synchronous processing\n")
 			making_video(args.topic, args.general_topic)